@@ -1,12 +1,11 @@
-import spacy
 import ast
 import os
 import re
-
-# -----------------------------
-# 🔹 Load spaCy transformer model
-# -----------------------------
-nlp = spacy.load("en_core_web_trf")
+import time
+from keyword_matcher import KeywordHit, KeywordMatcher
+from ner_artifact import build_artifact, save_artifact
+from nlp_models import resolve_model
+from skill_taxonomy import get_active_taxonomy
 
 # -----------------------------
 # 🔹 Keyword Dictionaries
@@ -70,27 +69,62 @@ def extract_project_names(text):
 
 
 # -----------------------------
-# 🔹 Main Function
+# 🔹 Structuring Helpers
 # -----------------------------
-def perform_full_ner(input_file, output_dir="NER_output_JD"):
-    """Perform NER + keyword extraction from tokens file."""
+# Keyword dictionaries in the order they are applied to the structured fields
+KEYWORD_FIELDS = [
+    ("SKILLS", SKILL_KEYWORDS),
+    ("EXPERIENCE", EXPERIENCE_KEYWORDS),
+    ("PROJECTS", PROJECT_KEYWORDS),
+    ("ACHIEVEMENTS", ACHIEVEMENT_KEYWORDS),
+    ("EDUCATION", EDU_KEYWORDS),
+]
 
-    # Read tokens
-    with open(input_file, "r", encoding="utf-8") as f:
-        data = f.read()
 
-    try:
-        tokens = ast.literal_eval(data)
-    except Exception as e:
-        print("⚠️ Error reading token list:", e)
-        return
+_keyword_matcher = None
+
 
-    text = " ".join(tokens).lower()
+def get_keyword_matcher():
+    """Compiled matcher over every keyword dictionary (built once)."""
+    global _keyword_matcher
+    if _keyword_matcher is None:
+        _keyword_matcher = KeywordMatcher(
+            [(word, field) for field, keywords in KEYWORD_FIELDS for word in keywords]
+        ).compile()
+    return _keyword_matcher
 
-    # Process text with spaCy
-    doc = nlp(text)
 
-    # Create structure
+def match_keywords(text):
+    """
+    All keyword hits in text as (start, end, keyword, field), single pass.
+    When an external skill taxonomy is active it replaces SKILL_KEYWORDS,
+    reporting canonical skill names for aliases.
+    """
+    hits = get_keyword_matcher().find(text)
+    taxonomy = get_active_taxonomy()
+    if taxonomy is not None:
+        hits = [hit for hit in hits if hit.label != "SKILLS"]
+        hits += [KeywordHit(h.start, h.end, h.keyword, "SKILLS") for h in taxonomy.find(text)]
+        hits.sort(key=lambda hit: (hit.end, hit.start))
+    return hits
+
+
+def find_keyword_hits(text, hits=None):
+    """Return the dictionary keywords found on token boundaries in text, per field."""
+    if hits is None:
+        hits = match_keywords(text)
+    found = {field: set() for field, _ in KEYWORD_FIELDS}
+    for hit in hits:
+        found[hit.label].add(hit.keyword)
+    return {field: sorted(words) for field, words in found.items()}
+
+
+def build_structured_data(entities, keyword_hits, text):
+    """
+    Merge spaCy entities, keyword hits and project names into the
+    NAME/ORG/EDUCATION/EXPERIENCE/PROJECTS/ACHIEVEMENTS/SKILLS dict.
+    `entities` is an iterable of dicts with "text" and "label" keys.
+    """
     structured_data = {
         "NAME": set(),
         "ORG": set(),
@@ -102,53 +136,118 @@ def perform_full_ner(input_file, output_dir="NER_output_JD"):
     }
 
     # --- Named Entity Recognition Extraction ---
-    for ent in doc.ents:
-        label = ent.label_
+    for ent in entities:
+        label = ent["label"]
         if label == "PERSON":
-            structured_data["NAME"].add(ent.text)
+            structured_data["NAME"].add(ent["text"])
         elif label == "ORG":
-            structured_data["ORG"].add(ent.text)
+            structured_data["ORG"].add(ent["text"])
         elif label in ["EDUCATION", "FAC"]:
-            structured_data["EDUCATION"].add(ent.text)
+            structured_data["EDUCATION"].add(ent["text"])
         elif label in ["WORK_OF_ART", "PRODUCT"]:
-            structured_data["PROJECTS"].add(ent.text)
+            structured_data["PROJECTS"].add(ent["text"])
 
     # --- Keyword-based detection ---
-    for skill in SKILL_KEYWORDS:
-        if skill in text:
-            structured_data["SKILLS"].add(skill)
-
-    for exp_word in EXPERIENCE_KEYWORDS:
-        if exp_word in text:
-            structured_data["EXPERIENCE"].add(exp_word)
-
-    for proj_word in PROJECT_KEYWORDS:
-        if proj_word in text:
-            structured_data["PROJECTS"].add(proj_word)
-
-    for ach_word in ACHIEVEMENT_KEYWORDS:
-        if ach_word in text:
-            structured_data["ACHIEVEMENTS"].add(ach_word)
-
-    for edu_word in EDU_KEYWORDS:
-        if edu_word in text:
-            structured_data["EDUCATION"].add(edu_word)
+    for field, words in keyword_hits.items():
+        structured_data[field].update(words)
 
     # --- Extract potential project names ---
     project_names = extract_project_names(text)
     structured_data["PROJECTS"].update(project_names)
 
     # Convert sets to sorted lists
-    structured_data = {k: sorted(list(v)) for k, v in structured_data.items()}
+    return {k: sorted(list(v)) for k, v in structured_data.items()}
+
+
+# -----------------------------
+# 🔹 Main Functions
+# -----------------------------
+def _analyze_for_ner(tokens_or_text, tier=None):
+    from analysis import analyze_document
+
+    if isinstance(tokens_or_text, str):
+        text = tokens_or_text
+    else:
+        text = " ".join(tokens_or_text).lower()
+
+    # Single shared spaCy pass (reused if this text was already analyzed)
+    return analyze_document(text, resolve_model(tier, "ner"))
 
-    # Prepare output folder
-    os.makedirs(output_dir, exist_ok=True)
-    output_file = os.path.join(output_dir, "ner_structured_output.txt")
 
-    # Save structured data
-    with open(output_file, "w", encoding="utf-8") as out:
-        for k, v in structured_data.items():
-            out.write(f"{k}: {v}\n")
+def save_ner_output(artifact, output_dir):
+    """Write a NER artifact to <output_dir>/ner_structured_output.ner."""
+    return save_artifact(artifact, output_dir)
+
+
+def perform_ner_artifact(tokens_or_text, output_dir=None, tier=None):
+    """
+    Like perform_ner, but return the typed NER artifact: structured fields
+    plus entity spans and keyword hits with their offsets.
+    """
+    artifact = build_artifact(_analyze_for_ner(tokens_or_text, tier))
+    if output_dir is not None:
+        save_ner_output(artifact, output_dir)
+    return artifact
+
+
+def perform_ner(tokens_or_text, output_dir=None, tier=None):
+    """
+    Perform NER + keyword extraction in memory and return the structured dict.
+    Accepts a token list (joined and lowercased, as read from a tokens file)
+    or raw text (analyzed as-is). Nothing touches the disk unless output_dir
+    is given, in which case the NER artifact is also saved there. tier
+    picks the spaCy model (see nlp_models.MODEL_TIERS).
+    """
+    if output_dir is not None:
+        return perform_ner_artifact(tokens_or_text, output_dir, tier)["fields"]
+    analysis = _analyze_for_ner(tokens_or_text, tier)
+    return {k: list(v) for k, v in analysis["ner"].items()}
+
+
+def perform_ner_batch(texts, batch_size=32, n_process=1, stats=None, tier=None):
+    """
+    perform_ner over many documents at once: texts (strings or token lists)
+    are streamed through nlp.pipe in batches of batch_size across n_process
+    processes, and the same structured dicts are returned in input order.
+    Throughput is printed and, if stats is a dict, stored in it.
+    """
+    from analysis import iter_analyze_documents
+
+    def prepared():
+        for item in texts:
+            yield item if isinstance(item, str) else " ".join(item).lower()
+
+    start = time.perf_counter()
+    results = [
+        {k: list(v) for k, v in analysis["ner"].items()}
+        for analysis in iter_analyze_documents(
+            prepared(), resolve_model(tier, "ner"), batch_size=batch_size, n_process=n_process
+        )
+    ]
+    seconds = time.perf_counter() - start
+    docs_per_sec = len(results) / seconds if seconds else 0.0
+    if stats is not None:
+        stats.update({"docs": len(results), "seconds": round(seconds, 3), "docs_per_sec": round(docs_per_sec, 2)})
+    print(f"✅ NER batch: {len(results)} docs in {seconds:.2f}s ({docs_per_sec:.1f} docs/sec)")
+    return results
+
+
+def perform_full_ner(input_file, output_dir="NER_output_JD"):
+    """Perform NER + keyword extraction from tokens file."""
+
+    # Read tokens
+    with open(input_file, "r", encoding="utf-8") as f:
+        data = f.read()
+
+    try:
+        tokens = ast.literal_eval(data)
+    except Exception as e:
+        print("⚠️ Error reading token list:", e)
+        return
+
+    artifact = perform_ner_artifact(tokens)
+    output_file = save_ner_output(artifact, output_dir)
+    structured_data = artifact["fields"]
 
     print(f"✅ NER + Keyword extraction complete.")
     print(f"📄 Structured output saved at: {output_file}")
@@ -1,14 +1,10 @@
 import os
-import pdfplumber
+import sys
 from fpdf import FPDF
 
-# Function to extract text from PDF
-def extract_text_from_pdf(pdf_path):
-    with pdfplumber.open(pdf_path) as pdf:
-        text = ""
-        for page in pdf.pages:
-            text += page.extract_text() + "\n"
-    return text.strip()
+# PDF text comes from the shared extraction layer in the 2.o backend
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from pdf_extraction import extract_pdf_text
 
 # Function to read the enhancement report
 def read_report(report_path):
@@ -126,7 +122,7 @@ def main():
     output_pdf = os.path.join(script_dir, "resume.pdf")
 
     # Extract original text
-    original_text = extract_text_from_pdf(pdf_path)
+    original_text = extract_pdf_text(pdf_path).strip()
 
     # Read enhancements
     enhanced_sentences, missing_skills = read_report(report_path)
@@ -0,0 +1,419 @@
+import asyncio
+import os
+import queue
+import random
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+
+import requests
+
+# Prompts, guardrails and report helpers are shared with the sync rewriter
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from Rewriter.rewriter import (
+    BATCH_SIZE,
+    get_gemini_api_key,
+    GEMINI_MODEL,
+    JSON_CONFIG,
+    LLM_CACHE_TTL,
+    SYSTEM_INSTRUCTIONS,
+    _as_ner_data,
+    build_batch_prompt,
+    build_rewrite_prompt,
+    build_skill_prompt,
+    find_skill_gaps,
+    forget_llm_response,
+    get_llm_cache,
+    llm_cache_key,
+    load_text,
+    parse_batch_response,
+    parse_skill_list,
+    select_project_sentences,
+    write_report,
+)
+
+# -----------------------------
+# 🔹 Async Gemini rewriter
+# -----------------------------
+# Rewrites every sentence concurrently instead of making 2 x sentences
+# blocking calls in a row. Calls go to the Gemini REST endpoint
+# (generateContent) and are bounded three ways: a semaphore caps requests
+# in flight, a token bucket caps the request rate, and each attempt has a
+# timeout. Failed attempts (429, 5xx, timeouts and any other transport
+# error from requests) are retried with jittered exponential backoff.
+# Results keep input order.
+#
+# Responses go through the same persistent LLM cache as gemini_infer. Its
+# SQLite reads and writes run on the client's threads, like the HTTP calls,
+# so they never block the event loop.
+# GEMINI_API_BASE points the client somewhere else, e.g. at
+# stub_llm_server.py for local testing.
+
+GEMINI_API_BASE = os.environ.get("GEMINI_API_BASE", "https://generativelanguage.googleapis.com")
+MAX_CONCURRENCY = 8
+RATE_PER_SECOND = 5.0
+BURST = 5
+MAX_RETRIES = 4
+CALL_TIMEOUT = 60.0
+BACKOFF_BASE = 0.5
+BACKOFF_MAX = 20.0
+
+RETRY_STATUS = {408, 429, 500, 502, 503, 504}
+
+
+class LLMError(RuntimeError):
+    """An LLM call failed permanently (or ran out of retries)."""
+
+
+class _RetryableError(Exception):
+    pass
+
+
+class TokenBucket:
+    """Async token bucket: `rate` tokens per second, at most `capacity` saved up."""
+
+    def __init__(self, rate, capacity):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self):
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+
+class AsyncGeminiClient:
+    """Rate-limited, retrying async client for Gemini generateContent."""
+
+    def __init__(self, model=GEMINI_MODEL, api_key=None, base_url=GEMINI_API_BASE,
+                 max_concurrency=MAX_CONCURRENCY, rate_per_second=RATE_PER_SECOND, burst=BURST,
+                 max_retries=MAX_RETRIES, timeout=CALL_TIMEOUT):
+        self.model = model if model.startswith("models/") else f"models/{model}"
+        self.api_key = api_key or get_gemini_api_key()
+        self.base_url = base_url.rstrip("/")
+        self.max_retries = max_retries
+        self.timeout = timeout
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._bucket = TokenBucket(rate_per_second, burst)
+        self._session = requests.Session()
+        # Blocking HTTP runs on our own threads, sized to the concurrency cap
+        self._executor = ThreadPoolExecutor(max_workers=max_concurrency)
+        self.stats = {"calls": 0, "retries": 0, "failures": 0, "cache_hits": 0}
+
+    def close(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        self._session.close()
+
+    def _post(self, prompt, system_instruction, generation_config):
+        body = {"contents": [{"role": "user", "parts": [{"text": prompt}]}]}
+        if system_instruction:
+            body["systemInstruction"] = {"parts": [{"text": system_instruction}]}
+        if generation_config:
+            body["generationConfig"] = generation_config
+        try:
+            response = self._session.post(
+                f"{self.base_url}/v1beta/{self.model}:generateContent",
+                params={"key": self.api_key},
+                json=body,
+                timeout=self.timeout,
+            )
+        except requests.RequestException as e:   # connection, timeout, SSL, chunked body, ...
+            raise _RetryableError(f"{type(e).__name__}: {e}")
+        if response.status_code in RETRY_STATUS:
+            raise _RetryableError(f"HTTP {response.status_code}")
+        if response.status_code != 200:
+            raise LLMError(f"HTTP {response.status_code}: {response.text[:200]}")
+        try:
+            parts = response.json()["candidates"][0]["content"]["parts"]
+        except (ValueError, KeyError, IndexError) as e:
+            raise LLMError(f"Unexpected response shape: {e}")
+        return "".join(part.get("text", "") for part in parts).strip()
+
+    async def generate(self, prompt, system_instruction=SYSTEM_INSTRUCTIONS, generation_config=None):
+        """Text response for prompt; raises LLMError once retries are exhausted."""
+        loop = asyncio.get_running_loop()
+        cache = await loop.run_in_executor(self._executor, get_llm_cache)
+        key = llm_cache_key(self.model, system_instruction, prompt, generation_config)
+        if cache is not None:
+            cached_text = await loop.run_in_executor(self._executor, cache.get, key)
+            if cached_text is not None:
+                self.stats["cache_hits"] += 1
+                return cached_text
+
+        text = await self._generate_uncached(prompt, system_instruction, generation_config)
+        if cache is not None:
+            await loop.run_in_executor(self._executor, partial(cache.set, key, text, ttl=LLM_CACHE_TTL))
+        return text
+
+    async def forget(self, prompt, system_instruction=SYSTEM_INSTRUCTIONS, generation_config=None):
+        """forget_llm_response() off the event loop."""
+        await asyncio.get_running_loop().run_in_executor(
+            self._executor,
+            partial(forget_llm_response, self.model, system_instruction, prompt, generation_config),
+        )
+
+    async def _generate_uncached(self, prompt, system_instruction, generation_config):
+        for attempt in range(self.max_retries + 1):
+            async with self._semaphore:
+                await self._bucket.acquire()
+                self.stats["calls"] += 1
+                try:
+                    loop = asyncio.get_running_loop()
+                    return await asyncio.wait_for(
+                        loop.run_in_executor(
+                            self._executor, self._post, prompt, system_instruction, generation_config
+                        ),
+                        timeout=self.timeout,
+                    )
+                except (_RetryableError, asyncio.TimeoutError) as e:
+                    error = str(e) or f"timed out after {self.timeout}s"
+                except LLMError:
+                    self.stats["failures"] += 1
+                    raise
+            if attempt < self.max_retries:
+                # Full jitter: sleep somewhere in [0, base * 2^attempt]
+                self.stats["retries"] += 1
+                await asyncio.sleep(random.uniform(0, min(BACKOFF_MAX, BACKOFF_BASE * 2 ** attempt)))
+        self.stats["failures"] += 1
+        raise LLMError(f"Gave up after {self.max_retries + 1} attempts: {error}")
+
+
+# -----------------------------
+# 🔹 Concurrent Rewriting
+# -----------------------------
+async def _sentence_items(client, sentence, cv_skills):
+    """[(skills, rewrite)] for one sentence via the two dependent calls."""
+    inferred_skills = parse_skill_list(await client.generate(build_skill_prompt(sentence)))
+    rewrite = await client.generate(build_rewrite_prompt(sentence, cv_skills, inferred_skills))
+    return [(inferred_skills, rewrite)]
+
+
+async def _batch_items(client, sentences, cv_skills):
+    """
+    [(skills, rewrite)] for a batch of sentences from one JSON request. An
+    invalid reply is retried as two concurrent half batches, down to the
+    per-sentence calls.
+    """
+    prompt = build_batch_prompt(sentences, cv_skills)
+    try:
+        response = await client.generate(prompt, generation_config=JSON_CONFIG)
+        return parse_batch_response(response, len(sentences))
+    except ValueError:
+        await client.forget(prompt, generation_config=JSON_CONFIG)
+        client.stats["batch_splits"] = client.stats.get("batch_splits", 0) + 1
+        if len(sentences) == 1:
+            return await _sentence_items(client, sentences[0], cv_skills)
+        mid = len(sentences) // 2
+        # Both halves run to completion before a failure is raised, so
+        # nothing is left in flight on the client
+        halves = await asyncio.gather(
+            _batch_items(client, sentences[:mid], cv_skills),
+            _batch_items(client, sentences[mid:], cv_skills),
+            return_exceptions=True,
+        )
+        for half in halves:
+            if isinstance(half, BaseException):
+                raise half
+        return halves[0] + halves[1]
+
+
+async def enhance_sentence_async(client, sentence, cv_skills):
+    """Infer a sentence's skills, then rewrite it (the two calls depend on each other)."""
+    return (await _sentence_items(client, sentence, cv_skills))[0][1]
+
+
+async def enhance_batch_async(client, sentences, cv_skills):
+    """Rewrite a batch of sentences with one JSON request (see _batch_items)."""
+    return [rewrite for _, rewrite in await _batch_items(client, sentences, cv_skills)]
+
+
+async def enhance_sentences_async(sentences, cv_skills, client=None, batch_size=BATCH_SIZE):
+    """
+    Rewrite all sentences concurrently; results are in input order. With a
+    batch_size, each request carries that many sentences (batched JSON
+    mode); batch_size=None makes two calls per sentence. A sentence whose
+    request fails keeps its original text, as in iter_enhanced_sentences.
+    """
+    own_client = client is None
+    client = client or AsyncGeminiClient()
+    step = batch_size or 1
+    chunks = [sentences[i:i + step] for i in range(0, len(sentences), step)]
+
+    async def rewrite(chunk):
+        if batch_size:
+            return await enhance_batch_async(client, chunk, cv_skills)
+        return [await enhance_sentence_async(client, chunk[0], cv_skills)]
+
+    try:
+        # Every request finishes before the client can be closed
+        results = await asyncio.gather(*(rewrite(chunk) for chunk in chunks), return_exceptions=True)
+    finally:
+        if own_client:
+            client.close()
+
+    rewrites = []
+    for chunk, result in zip(chunks, results):
+        if isinstance(result, LLMError):
+            print(f"⚠️ Kept {len(chunk)} original sentence(s): {result}")
+            rewrites.extend(chunk)
+        elif isinstance(result, BaseException):
+            raise result
+        else:
+            rewrites.extend(result)
+    return rewrites
+
+
+# -----------------------------
+# 🔹 Streaming Results
+# -----------------------------
+# Results are yielded as soon as their request finishes (completion order,
+# not input order), so a UI can show the first rewrites while the rest are
+# still in flight. Each result is a dict:
+#   index     position in the input sentences
+#   original  the sentence as sent
+#   skills    skills inferred for it
+#   rewrite   the rewritten sentence (None if the request failed)
+#   latency   seconds from the start of the run until this result was ready
+#   error     why the request failed (only on failures)
+
+async def iter_enhanced_sentences(sentences, cv_skills, client=None, batch_size=BATCH_SIZE):
+    """Async generator yielding one result dict per sentence as it completes."""
+    own_client = client is None
+    client = client or AsyncGeminiClient()
+    start = time.perf_counter()
+    step = batch_size or 1
+
+    async def run(offset, chunk):
+        try:
+            if batch_size:
+                return offset, chunk, await _batch_items(client, chunk, cv_skills), None
+            return offset, chunk, await _sentence_items(client, chunk[0], cv_skills), None
+        except LLMError as e:
+            return offset, chunk, [([], None)] * len(chunk), str(e)
+
+    tasks = [asyncio.ensure_future(run(i, sentences[i:i + step])) for i in range(0, len(sentences), step)]
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            offset, chunk, items, error = await next_done
+            latency = round(time.perf_counter() - start, 3)
+            for i, (sentence, (skills, rewrite)) in enumerate(zip(chunk, items)):
+                result = {"index": offset + i, "original": sentence, "skills": skills,
+                          "rewrite": rewrite, "latency": latency}
+                if error:
+                    result["error"] = error
+                yield result
+    finally:
+        for task in tasks:
+            task.cancel()
+        if own_client:
+            client.close()
+
+
+def stream_enhanced_sentences(sentences, cv_skills, batch_size=BATCH_SIZE, **client_kwargs):
+    """
+    Blocking generator over iter_enhanced_sentences for sync callers such as
+    Streamlit. The event loop (and its client) runs on a background thread;
+    results are handed over through a queue as they arrive. Closing the
+    generator early (a Streamlit rerun, a break) cancels the requests that
+    have not finished yet.
+    """
+    results = queue.Queue()
+    done = object()
+    stop = threading.Event()
+    running = {}
+
+    async def pump():
+        running["loop"], running["task"] = asyncio.get_running_loop(), asyncio.current_task()
+        if stop.is_set():   # closed before the loop was up
+            return
+        client = AsyncGeminiClient(**client_kwargs)
+        stream = iter_enhanced_sentences(sentences, cv_skills, client, batch_size)
+        try:
+            async for result in stream:
+                if stop.is_set():
+                    break
+                results.put(result)
+        finally:
+            await stream.aclose()   # cancels the chunks still in flight
+            client.close()
+
+    def worker():
+        try:
+            asyncio.run(pump())
+        except asyncio.CancelledError:
+            pass
+        except Exception as e:
+            results.put(e)
+        finally:
+            results.put(done)
+
+    threading.Thread(target=worker, daemon=True).start()
+    try:
+        while True:
+            result = results.get()
+            if result is done:
+                return
+            if isinstance(result, Exception):
+                raise result
+            yield result
+    finally:
+        stop.set()
+        if "task" in running:
+            try:
+                running["loop"].call_soon_threadsafe(running["task"].cancel)
+            except RuntimeError:   # the loop already finished
+                pass
+
+
+async def enhance_resume_async(cv_ner_file, jd_ner_file, cv_extracted_file, output_report, client=None,
+                               batch_size=BATCH_SIZE):
+    """enhance_resume() with the sentence rewrites running concurrently."""
+    cv_ner = _as_ner_data(cv_ner_file)
+    jd_ner = _as_ner_data(jd_ner_file)
+
+    cv_skills = cv_ner.get("SKILLS", [])
+    jd_skills = jd_ner.get("SKILLS", [])
+    project_sentences = select_project_sentences(load_text(cv_extracted_file), jd_skills)
+
+    start = time.perf_counter()
+    enhanced_projects = list(project_sentences)
+    async for result in iter_enhanced_sentences(project_sentences, cv_skills, client, batch_size):
+        if result["rewrite"] is None:
+            print(f"⚠️ Kept original sentence {result['index']}: {result['error']}")
+            continue
+        enhanced_projects[result["index"]] = result["rewrite"]
+        print(f"📄 [{result['latency']:.1f}s] {result['rewrite']}")
+    missing_skills = find_skill_gaps(cv_skills, jd_skills)
+
+    write_report(output_report, enhanced_projects, missing_skills)
+    print(f"✅ Resume enhancement complete in {time.perf_counter() - start:.1f}s. "
+          f"Report saved at: {output_report}")
+
+
+def enhance_resume_concurrent(*args, **kwargs):
+    """Blocking wrapper around enhance_resume_async (same arguments as enhance_resume)."""
+    return asyncio.run(enhance_resume_async(*args, **kwargs))
+
+
+if __name__ == "__main__":
+    from ner_artifact import find_ner_output
+
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    base_dir = os.path.join(script_dir, "..")
+    enhance_resume_concurrent(
+        find_ner_output(os.path.join(base_dir, "NER_output_CV")),
+        find_ner_output(os.path.join(base_dir, "NER_output_JD")),
+        os.path.join(base_dir, "preprocessing_output_CV", "extracted_text.txt"),
+        os.path.join(script_dir, "Resume_Enhancement_Report.txt"),
+    )
@@ -0,0 +1,179 @@
+import re
+
+# -----------------------------
+# 🔹 Sentence Selection for the Rewriter
+# -----------------------------
+# The rewriter used to send every line of the parse output to the LLM, one
+# call per token row. Instead, the original extracted text is split into
+# sentences (PDF soft line wraps joined, headings and bullets kept apart),
+# and only the ones worth rewriting are kept: project/experience bullets
+# that don't already mention most of the JD skills.
+
+BULLET_RE = re.compile(r"^\s*(?:[•‣▪●◦⁃∙*\-–—•]|\d+[.)])\s+")
+SENTENCE_END_RE = re.compile(r"(?<=[.!?])\s+(?=[\"'(\[]?[A-Z0-9])")
+DATE_RE = re.compile(
+    r"\b(?:jan|feb|mar|apr|may|jun|jul|aug|sep|sept|oct|nov|dec)[a-z]*\.?\s+\d{4}\b|\b(?:19|20)\d{2}\b",
+    re.I,
+)
+CONTACT_RE = re.compile(r"@|https?://|www\.|\+?\d[\d\s().-]{7,}\d")
+
+# Lowercase words that may appear inside a Title Case heading
+HEADING_STOPWORDS = {"and", "of", "the", "in", "for", "to", "a", "an", "&", "-", "–", "|", "at", "on"}
+
+MIN_WORDS = 5
+MAX_WORDS = 80
+MAX_JD_SKILL_HITS = 2
+MAX_SENTENCES = 25
+
+ACTION_VERBS = {
+    "achieved", "analyzed", "analysed", "architected", "automated", "built", "collaborated",
+    "conducted", "configured", "contributed", "created", "deployed", "designed", "developed",
+    "delivered", "engineered", "enhanced", "established", "evaluated", "executed", "extracted",
+    "implemented", "improved", "increased", "integrated", "introduced", "launched", "led",
+    "maintained", "managed", "migrated", "modeled", "monitored", "optimized", "optimised",
+    "organized", "performed", "planned", "programmed", "prototyped", "reduced", "refactored",
+    "researched", "resolved", "scaled", "streamlined", "supported", "tested", "trained",
+    "wrote", "worked",
+}
+
+PROJECT_TERMS = {
+    "api", "apis", "app", "application", "applications", "architecture", "backend", "client",
+    "clients", "dashboard", "database", "databases", "dataset", "deployment", "experience",
+    "feature", "features", "frontend", "functions", "intern", "internship", "model", "models",
+    "module", "pipeline", "pipelines", "platform", "project", "projects", "prototype",
+    "service", "services", "system", "systems", "team", "tool", "tools", "users", "website",
+}
+
+
+# -----------------------------
+# 🔹 Segmentation
+# -----------------------------
+
+def _is_heading(line):
+    """Short all-caps or Title Case lines without end punctuation (section/role/company names)."""
+    words = line.split()
+    if not words or line.endswith((".", "!", "?", ",", ";", ":")) or len(words) > 8:
+        return False
+    letters = [c for c in line if c.isalpha()]
+    if letters and all(c.isupper() for c in letters):
+        return True
+    # Bullets start with an action verb; a trailing "for"/"and" means the line wraps
+    if words[0].lower() in ACTION_VERBS or words[-1].lower() in HEADING_STOPWORDS:
+        return False
+    return all(w[0].isupper() or not w[0].isalpha() or w.lower() in HEADING_STOPWORDS for w in words)
+
+
+def _is_standalone(line):
+    """Lines that never join a neighbour: headings, dates and contact details."""
+    return _is_heading(line) or bool(CONTACT_RE.search(line)) or (
+        DATE_RE.search(line) and len(line.split()) <= 6
+    )
+
+
+def split_sentences(text):
+    """
+    Split extracted resume text into sentences. Soft-wrapped lines are
+    joined back together; bullets, headings, dates and contact lines start
+    a new unit; joined blocks are then split at sentence punctuation.
+    """
+    blocks, current = [], []
+
+    def flush():
+        if current:
+            blocks.append(" ".join(current))
+            current.clear()
+
+    for raw_line in text.splitlines():
+        if not raw_line.strip():
+            flush()
+            continue
+        line = BULLET_RE.sub("", raw_line).strip()
+        if not line:
+            continue
+        # Extraction often turns bullet glyphs into indentation; an indented
+        # lowercase line is a wrapped continuation instead
+        bullet = BULLET_RE.match(raw_line) or (raw_line[:1].isspace() and not line[0].islower())
+        if _is_standalone(line):
+            flush()
+            blocks.append(line)
+            continue
+        if bullet or (current and current[-1].endswith((".", "!", "?"))):
+            flush()
+        current.append(line)
+    flush()
+
+    sentences = []
+    for block in blocks:
+        for sentence in SENTENCE_END_RE.split(re.sub(r"\s+", " ", block)):
+            sentence = sentence.strip()
+            if sentence:
+                sentences.append(sentence)
+    return sentences
+
+
+# -----------------------------
+# 🔹 Relevance Filter
+# -----------------------------
+
+def _skill_pattern(skill):
+    return re.compile(r"(?<![\w+#.])" + re.escape(skill.lower()) + r"(?![\w+#])")
+
+
+def mentioned_skills(sentence, skills):
+    """Skills (from the given list) that the sentence already mentions."""
+    lowered = sentence.lower()
+    return [s for s in skills if s.strip() and _skill_pattern(s.strip()).search(lowered)]
+
+
+def _is_list(sentence):
+    """Comma-separated lists of short items, e.g. a skills line."""
+    items = [item.split() for item in re.split(r"[,;|]", sentence.rstrip(".")) if item.strip()]
+    return len(items) >= 4 and sum(len(item) <= 3 for item in items) >= 0.75 * len(items)
+
+
+def is_project_sentence(sentence):
+    """A project/experience bullet: long enough and led by an action verb or about a project."""
+    words = re.findall(r"[A-Za-z][A-Za-z+#.-]*", sentence)
+    if not MIN_WORDS <= len(words) <= MAX_WORDS or CONTACT_RE.search(sentence) or _is_list(sentence):
+        return False
+    lowered = [w.lower().rstrip(".") for w in words]
+    return lowered[0] in ACTION_VERBS or any(w in PROJECT_TERMS for w in lowered)
+
+
+def select_sentences(sentences, jd_skills=(), max_jd_hits=MAX_JD_SKILL_HITS,
+                     max_sentences=MAX_SENTENCES):
+    """
+    Keep project/experience sentences that still lack JD skills (fewer than
+    max_jd_hits of them mentioned), deduplicated, in resume order.
+    """
+    selected, seen = [], set()
+    for sentence in sentences:
+        key = sentence.lower()
+        if key in seen or not is_project_sentence(sentence):
+            continue
+        seen.add(key)
+        if jd_skills and len(mentioned_skills(sentence, jd_skills)) >= max_jd_hits:
+            continue
+        selected.append(sentence)
+        if max_sentences and len(selected) >= max_sentences:
+            break
+    return selected
+
+
+def select_rewrite_candidates(extracted_text, jd_skills=(), **kwargs):
+    """split_sentences() + select_sentences() over the original extracted text."""
+    return select_sentences(split_sentences(extracted_text), jd_skills, **kwargs)
+
+
+if __name__ == "__main__":
+    import os
+
+    sample = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..",
+                          "preprocessing_output_CV", "extracted_text.txt")
+    with open(sample, "r", encoding="utf-8") as f:
+        text = f.read()
+    sentences = split_sentences(text)
+    selected = select_sentences(sentences)
+    print(f"📄 {len(sentences)} sentences, {len(selected)} selected for rewriting:")
+    for s in selected:
+        print(f"- {s}")
@@ -0,0 +1,105 @@
+import argparse
+import json
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# -----------------------------
+# 🔹 Local stand-in for the Gemini API
+# -----------------------------
+# Answers POST /v1beta/models/<model>:generateContent like Gemini does, with
+# configurable latency and random 429/500 failures, so the async rewriter
+# can be exercised without network access or API quota:
+#
+#   python stub_llm_server.py --port 8765 --latency 0.3 --fail-rate 0.1
+#   GEMINI_API_BASE=http://127.0.0.1:8765 python async_rewriter.py
+#
+# Skill-inference prompts get a fixed skill list, batch prompts a JSON
+# array (or, with --bad-json-rate, sometimes a truncated one); any other
+# prompt gets its quoted sentence back, prefixed with "Enhanced:".
+
+
+def stub_reply(prompt, bad_json_rate=0.0):
+    if "Respond only with a JSON array" in prompt:
+        items = json.loads(prompt.split("Sentences:", 1)[1].strip())
+        reply = json.dumps([
+            {"id": item["id"], "skills": ["python"], "rewrite": f"Enhanced: {item['sentence']}"}
+            for item in items
+        ])
+        return reply[:len(reply) // 2] if random.random() < bad_json_rate else reply
+    if "comma-separated list" in prompt:
+        return "python, sql, git"
+    quoted = re.search(r'Original sentence: "(.*)"', prompt, re.S)
+    return f"Enhanced: {quoted.group(1) if quoted else prompt.strip()[:80]}"
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    latency = 0.0
+    fail_rate = 0.0
+    bad_json_rate = 0.0
+    stats = {"requests": 0, "failed": 0, "max_in_flight": 0}
+    _in_flight = 0
+    _lock = threading.Lock()
+
+    def do_POST(self):
+        cls = type(self)
+        with cls._lock:
+            cls._in_flight += 1
+            cls.stats["requests"] += 1
+            cls.stats["max_in_flight"] = max(cls.stats["max_in_flight"], cls._in_flight)
+        try:
+            body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+            time.sleep(self.latency)
+            if random.random() < self.fail_rate:
+                with cls._lock:
+                    cls.stats["failed"] += 1
+                self._send(random.choice([429, 500]), {"error": {"message": "stub failure"}})
+                return
+            prompt = "".join(p.get("text", "") for c in body.get("contents", []) for p in c.get("parts", []))
+            self._send(200, {"candidates": [{"content": {"role": "model", "parts": [{"text": self.reply(prompt)}]}}]})
+        finally:
+            with cls._lock:
+                cls._in_flight -= 1
+
+    def reply(self, prompt):
+        return stub_reply(prompt, self.bad_json_rate)
+
+    def _send(self, status, payload):
+        data = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_stub_server(port=0, latency=0.0, fail_rate=0.0, bad_json_rate=0.0):
+    """Run the stub in a background thread; returns (server, base_url)."""
+    handler = type("Handler", (StubHandler,), {
+        "latency": latency, "fail_rate": fail_rate, "bad_json_rate": bad_json_rate,
+        "stats": {"requests": 0, "failed": 0, "max_in_flight": 0},
+    })
+    server = ThreadingHTTPServer(("127.0.0.1", port), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Stub Gemini generateContent server")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=0.2)
+    parser.add_argument("--fail-rate", type=float, default=0.0)
+    parser.add_argument("--bad-json-rate", type=float, default=0.0)
+    args = parser.parse_args()
+
+    server, url = start_stub_server(args.port, args.latency, args.fail_rate, args.bad_json_rate)
+    print(f"✅ Stub LLM server listening on {url}")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
@@ -0,0 +1,156 @@
+import asyncio
+import os
+import random
+import sys
+import threading
+import time
+
+import pytest
+import requests
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from Rewriter import async_rewriter
+from Rewriter.async_rewriter import AsyncGeminiClient, enhance_sentences_async, stream_enhanced_sentences
+from Rewriter.stub_llm_server import start_stub_server
+
+# -----------------------------
+# 🔹 Async rewriter against the local stub server
+# -----------------------------
+# The stub injects random 429/500 failures and truncated JSON batches;
+# request counts are high enough (and retries generous enough) that every
+# injection fires and no request runs out of retries.
+
+SENTENCES = [f"Built service number {i} with Flask and PostgreSQL" for i in range(48)]
+EXPECTED = [f"Enhanced: {sentence}" for sentence in SENTENCES]
+
+
+@pytest.fixture(autouse=True)
+def no_llm_cache(monkeypatch):
+    monkeypatch.setenv("LLM_CACHE_PATH", "none")
+    monkeypatch.setattr(async_rewriter, "BACKOFF_BASE", 0.001)
+    random.seed(1234)
+
+
+@pytest.fixture
+def stub():
+    servers = []
+
+    def start(**kwargs):
+        server, url = start_stub_server(**kwargs)
+        servers.append(server)
+        return server, url
+
+    yield start
+    for server in servers:
+        server.shutdown()
+        server.server_close()
+
+
+def make_client(url, **kwargs):
+    kwargs.setdefault("rate_per_second", 1000.0)
+    kwargs.setdefault("burst", 1000)
+    return AsyncGeminiClient(api_key="test-key", base_url=url, **kwargs)
+
+
+async def _enhance(url, sentences, batch_size, **client_kwargs):
+    client = make_client(url, **client_kwargs)
+    try:
+        return await enhance_sentences_async(sentences, ["python"], client, batch_size), client.stats
+    finally:
+        client.close()
+
+
+def test_order_retries_and_batch_splits(stub):
+    server, url = stub(fail_rate=0.4, bad_json_rate=0.5)
+    rewrites, stats = asyncio.run(_enhance(url, SENTENCES, batch_size=3, max_retries=20))
+
+    assert rewrites == EXPECTED
+    assert server.RequestHandlerClass.stats["failed"] > 0
+    assert stats["retries"] == server.RequestHandlerClass.stats["failed"]
+    assert stats["batch_splits"] > 0
+    assert stats["failures"] == 0
+
+
+def test_rate_limit_and_concurrency_cap(stub):
+    server, url = stub(latency=0.02)
+    rate, burst, concurrency = 20.0, 2, 3
+    start = time.perf_counter()
+    rewrites, stats = asyncio.run(_enhance(
+        url, SENTENCES[:12], batch_size=None,
+        rate_per_second=rate, burst=burst, max_concurrency=concurrency,
+    ))
+    elapsed = time.perf_counter() - start
+
+    assert rewrites == EXPECTED[:12]
+    assert stats["calls"] == 24   # skill inference + rewrite per sentence
+    assert elapsed >= (stats["calls"] - burst) / rate * 0.95
+    assert server.RequestHandlerClass.stats["max_in_flight"] <= concurrency
+
+
+def test_failed_requests_keep_original_sentences(stub):
+    _, url = stub(fail_rate=1.0)
+    rewrites, stats = asyncio.run(_enhance(url, SENTENCES[:6], batch_size=2, max_retries=1))
+    assert rewrites == SENTENCES[:6]
+    assert stats["failures"] == 3
+
+    results = list(stream_enhanced_sentences(
+        SENTENCES[:4], ["python"], batch_size=2,
+        api_key="test-key", base_url=url, max_retries=1,
+    ))
+    assert sorted(result["index"] for result in results) == [0, 1, 2, 3]
+    assert all(result["rewrite"] is None and "error" in result for result in results)
+
+
+def test_transport_errors_are_retried(stub, monkeypatch):
+    _, url = stub()
+    client = make_client(url, max_retries=3)
+    post = client._session.post
+    errors = iter([requests.exceptions.ChunkedEncodingError("truncated"), requests.exceptions.SSLError("eof")])
+
+    def flaky_post(*args, **kwargs):
+        error = next(errors, None)
+        if error is not None:
+            raise error
+        return post(*args, **kwargs)
+
+    monkeypatch.setattr(client._session, "post", flaky_post)
+    try:
+        assert asyncio.run(client.generate("x")) == "Enhanced: x"
+    finally:
+        client.close()
+    assert client.stats["retries"] == 2
+
+
+def test_llm_cache_runs_off_the_event_loop(stub, monkeypatch):
+    _, url = stub()
+    threads = []
+
+    class RecordingCache(dict):
+        def get(self, key, default=None):
+            threads.append(threading.get_ident())
+            return super().get(key, default)
+
+        def set(self, key, value, ttl=None):
+            threads.append(threading.get_ident())
+            self[key] = value
+
+    cache = RecordingCache()
+    monkeypatch.setattr(async_rewriter, "get_llm_cache", lambda: cache)
+    rewrites, stats = asyncio.run(_enhance(url, SENTENCES[:4], batch_size=2))
+    assert rewrites == EXPECTED[:4]
+    assert len(threads) == 4 and threading.get_ident() not in threads
+
+
+def test_closing_the_stream_cancels_remaining_requests(stub):
+    server, url = stub(latency=0.05)
+    stream = stream_enhanced_sentences(
+        SENTENCES, ["python"], batch_size=2,
+        api_key="test-key", base_url=url, rate_per_second=1000.0, burst=1000, max_concurrency=2,
+    )
+    next(stream)
+    stream.close()
+    time.sleep(0.3)
+    sent = server.RequestHandlerClass.stats["requests"]
+    time.sleep(0.3)
+    assert server.RequestHandlerClass.stats["requests"] == sent
+    assert sent <= 4   # of 24 batch requests
@@ -1,22 +1,16 @@
 import os
+import sys
 from sklearn.feature_extraction.text import CountVectorizer
 from sklearn.metrics.pairwise import cosine_similarity
 
+# NER artifact helpers live in the 2.o backend
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from ner_artifact import find_ner_output, load_ner_data, ner_fields
+
 # -----------------------------
 # 🔹 Helper Functions
 # -----------------------------
 
-def load_ner_data(file_path):
-    """Load structured NER data from file and convert to dictionary."""
-    ner_data = {}
-    with open(file_path, "r", encoding="utf-8") as f:
-        for line in f:
-            if ":" in line:
-                key, value = line.strip().split(":", 1)
-                value = value.strip().strip("[]").replace("'", "").split(", ")
-                ner_data[key.strip()] = [v.strip() for v in value if v.strip()]
-    return ner_data
-
 def calculate_cosine_similarity(list1, list2):
     """Calculate cosine similarity between two lists of words (for skills/experience)."""
     if not list1 or not list2:
@@ -89,13 +83,13 @@ def normalize_experience(exp):
 # 🔹 Main Matching Function
 # -----------------------------
 
-def match_resume_jd(cv_file, jd_file):
-    """Compare CV and JD NER outputs; score based on skills, experience, education."""
-
-    output_dir = os.path.dirname(os.path.abspath(__file__))
-
-    cv_data = load_ner_data(cv_file)
-    jd_data = load_ner_data(jd_file)
+def score_ner_data(cv_data, jd_data):
+    """
+    Score in-memory CV and JD NER data (plain dicts or NER artifacts);
+    returns (match_scores, overall_match).
+    """
+    cv_data = ner_fields(cv_data)
+    jd_data = ner_fields(jd_data)
 
     # Fields and weights
     fields = ["SKILLS", "EXPERIENCE", "EDUCATION", "PROJECTS", "ACHIEVEMENTS"]
@@ -130,6 +124,18 @@ def match_resume_jd(cv_file, jd_file):
             weighted_score += similarity * weighted_fields[field]
 
     overall_match = round(weighted_score, 2)
+    return match_scores, overall_match
+
+
+def match_resume_jd(cv_file, jd_file):
+    """Compare CV and JD NER outputs; score based on skills, experience, education."""
+
+    output_dir = os.path.dirname(os.path.abspath(__file__))
+
+    cv_data = load_ner_data(cv_file)
+    jd_data = load_ner_data(jd_file)
+
+    match_scores, overall_match = score_ner_data(cv_data, jd_data)
 
     # Save detailed report
     output_file = os.path.join(output_dir, "Resume_JD_Match_Report.txt")
@@ -167,7 +173,7 @@ def match_resume_jd(cv_file, jd_file):
 # 🔹 MAIN EXECUTION
 # -----------------------------
 if __name__ == "__main__":
-    cv_file = os.path.join("..", "NER_output_CV", "ner_structured_output.txt")
-    jd_file = os.path.join("..", "NER_output_JD", "ner_structured_output.txt")
+    cv_file = find_ner_output(os.path.join("..", "NER_output_CV"))
+    jd_file = find_ner_output(os.path.join("..", "NER_output_JD"))
 
     match_resume_jd(cv_file, jd_file)
@@ -0,0 +1,131 @@
+import numpy as np
+from sklearn.feature_extraction.text import CountVectorizer
+from sklearn.preprocessing import normalize
+
+from ner_artifact import ner_fields
+from Similarity.Resume_JD_Matching import (
+    normalize_education,
+    normalize_experience,
+    normalize_skills,
+)
+
+# -----------------------------
+# 🔹 One JD vs many resumes
+# -----------------------------
+# Same scores as score_ner_data / match_resume_jd, but for a whole batch of
+# resumes at once: the JD is prepared once, each field of every resume goes
+# into one sparse count matrix over a shared vocabulary, and the cosine
+# scores come out of a single normalize + sparse dot per field.
+#
+# The per-pair function fits a CountVectorizer on just the two texts; adding
+# other documents' terms only adds zero columns, so the cosine (and its
+# summation order, which follows the sorted vocabulary) is unchanged.
+
+FIELDS = ["SKILLS", "EXPERIENCE", "EDUCATION", "PROJECTS", "ACHIEVEMENTS"]
+WEIGHTED_FIELDS = {"SKILLS": 0.5, "EXPERIENCE": 0.3, "EDUCATION": 0.2}
+
+
+def _prepare_field(field, values):
+    """Apply the same per-field normalization as score_ner_data."""
+    if field == "EDUCATION":
+        return normalize_education(values)
+    if field == "SKILLS":
+        return normalize_skills(values)
+    if field == "EXPERIENCE":
+        return normalize_experience(values)
+    return values
+
+
+class BatchMatcher:
+    """Scores one compiled JD against any number of resume NER dicts or artifacts."""
+
+    def __init__(self, jd_data):
+        jd_data = ner_fields(jd_data)
+        self.jd_fields = {
+            field: _prepare_field(field, jd_data.get(field, [])) for field in FIELDS
+        }
+        self.jd_texts = {field: " ".join(values) for field, values in self.jd_fields.items()}
+        self.jd_education = set(self.jd_fields["EDUCATION"])
+
+    def _cosine_scores(self, field, resume_lists):
+        """Vectorized calculate_cosine_similarity(resume, jd) for one field."""
+        scores = np.zeros(len(resume_lists))
+        if not self.jd_fields[field]:
+            return scores
+
+        non_empty = np.array([bool(values) for values in resume_lists], dtype=bool)
+        if not non_empty.any():
+            return scores
+        texts = [" ".join(values) for values in resume_lists]
+
+        vectorizer = CountVectorizer()
+        try:
+            vectorizer.fit([t for t, keep in zip(texts, non_empty) if keep] + [self.jd_texts[field]])
+        except ValueError:
+            # No countable terms in any document (the per-pair function raises here)
+            return scores
+
+        resumes = normalize(vectorizer.transform(texts).astype(np.float64))
+        jd = normalize(vectorizer.transform([self.jd_texts[field]]).astype(np.float64))
+        similarity = (resumes @ jd.T).toarray().ravel()
+        scores[non_empty] = np.round(similarity[non_empty] * 100, 2)
+        return scores
+
+    def _education_scores(self, resume_lists):
+        """calculate_education_similarity(resume, jd) for every resume."""
+        scores = np.zeros(len(resume_lists))
+        if not self.jd_education:
+            return scores
+        for i, values in enumerate(resume_lists):
+            cv_set = set(values)
+            if cv_set:
+                overlap = len(cv_set & self.jd_education)
+                scores[i] = round(overlap / len(self.jd_education) * 100, 2)
+        return scores
+
+    def score_matrix(self, resumes):
+        """
+        Score a list of resume NER dicts; returns {field: scores array} plus
+        "OVERALL" with the weighted Skills/Experience/Education score.
+        """
+        resumes = [ner_fields(r) for r in resumes]
+        scores = {}
+        for field in FIELDS:
+            resume_lists = [_prepare_field(field, r.get(field, [])) for r in resumes]
+            if field == "EDUCATION":
+                scores[field] = self._education_scores(resume_lists)
+            else:
+                scores[field] = self._cosine_scores(field, resume_lists)
+
+        # Accumulate in the same order as score_ner_data
+        weighted = np.zeros(len(resumes))
+        for field in FIELDS:
+            if field in WEIGHTED_FIELDS:
+                weighted = weighted + scores[field] * WEIGHTED_FIELDS[field]
+        overall = np.round(weighted, 2)
+
+        # score_ner_data rounds with Python's round() when neither cosine field
+        # was computed (both returned a plain 0.0); mirror that exactly.
+        python_rounded = [
+            i for i, r in enumerate(resumes)
+            if not (r.get("SKILLS") and self.jd_fields["SKILLS"])
+            and not (r.get("EXPERIENCE") and self.jd_fields["EXPERIENCE"])
+        ]
+        for i in python_rounded:
+            overall[i] = round(float(weighted[i]), 2)
+
+        scores["OVERALL"] = overall
+        return scores
+
+    def score(self, resumes):
+        """Per-resume (match_scores, overall_match) tuples, like score_ner_data."""
+        matrix = self.score_matrix(resumes)
+        return [
+            ({field: float(matrix[field][i]) for field in FIELDS}, float(matrix["OVERALL"][i]))
+            for i in range(len(resumes))
+        ]
+
+
+def score_resumes_batch(jd_data, resumes):
+    """Score many resume NER dicts against one JD NER dict."""
+    return BatchMatcher(jd_data).score(resumes)
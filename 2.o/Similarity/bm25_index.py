@@ -0,0 +1,273 @@
+import heapq
+import math
+import os
+import pickle
+import re
+from array import array
+from bisect import bisect_left
+from collections import Counter
+
+from atomic_file import atomic_write
+
+# -----------------------------
+# 🔹 BM25 candidate retrieval
+# -----------------------------
+# Inverted index over normalized resume text and NER fields. A JD's terms
+# retrieve the top-k resumes with BM25, using MaxScore query processing:
+# terms whose combined upper-bound score cannot lift a document into the
+# current top-k are never scanned, only probed for already-promising
+# documents. Resumes can be added/deleted incrementally and the whole index
+# snapshotted to disk for fast restarts (pipeline_cli.py --index builds and
+# searches snapshots).
+#
+# Deleted documents are tombstoned and skipped at query time; their postings
+# (and their share of N/df/avgdl) are dropped by compact(), which runs
+# automatically once COMPACT_RATIO of the documents are deleted.
+
+SNAPSHOT_FORMAT_VERSION = 1
+COMPACT_RATIO = 0.2
+NER_FIELDS = ["SKILLS", "EXPERIENCE", "EDUCATION", "PROJECTS", "ACHIEVEMENTS"]
+
+_TOKEN_RE = re.compile(r"[a-z0-9][a-z0-9+#.\-]*")
+
+
+def document_terms(text="", ner_data=None):
+    """
+    Index/query terms for a document: lowercase word tokens from the text
+    plus one "field:value" term per NER value (e.g. "skills:machine learning").
+    """
+    terms = [t.rstrip(".-") for t in _TOKEN_RE.findall((text or "").lower())]
+    terms = [t for t in terms if t]
+    for field in NER_FIELDS:
+        for value in (ner_data or {}).get(field, []):
+            value = " ".join(str(value).lower().split())
+            if value:
+                terms.append(f"{field.lower()}:{value}")
+    return terms
+
+
+class BM25Index:
+    """Incremental BM25 inverted index with MaxScore top-k search."""
+
+    def __init__(self, k1=1.2, b=0.75):
+        self.k1 = k1
+        self.b = b
+        self._postings = {}       # term -> [doc ids array, tf array, max tf]
+        self._doc_len = array("I")
+        self._doc_keys = []       # internal doc id -> external key
+        self._key_to_doc = {}
+        self._deleted = set()
+        self._total_len = 0
+        self._min_len = None
+
+    def __len__(self):
+        return len(self._key_to_doc)
+
+    def __contains__(self, key):
+        return key in self._key_to_doc
+
+    # -----------------------------
+    # 🔹 Updates
+    # -----------------------------
+    def add(self, key, text="", ner_data=None, terms=None):
+        """Index a resume under key (replacing any previous version of it)."""
+        if key in self._key_to_doc:
+            self.delete(key)
+        if terms is None:
+            terms = document_terms(text, ner_data)
+
+        doc_id = len(self._doc_keys)
+        counts = Counter(terms)
+        for term, tf in counts.items():
+            entry = self._postings.get(term)
+            if entry is None:
+                entry = [array("I"), array("I"), 0]
+                self._postings[term] = entry
+            entry[0].append(doc_id)    # doc ids are assigned in increasing order
+            entry[1].append(tf)
+            if tf > entry[2]:
+                entry[2] = tf
+
+        length = len(terms)
+        self._doc_len.append(length)
+        self._doc_keys.append(key)
+        self._key_to_doc[key] = doc_id
+        self._total_len += length
+        if length and (self._min_len is None or length < self._min_len):
+            self._min_len = length
+        return doc_id
+
+    def delete(self, key):
+        doc_id = self._key_to_doc.pop(key, None)
+        if doc_id is None:
+            return False
+        self._deleted.add(doc_id)
+        if len(self._deleted) > COMPACT_RATIO * len(self._doc_keys):
+            self.compact()
+        return True
+
+    def compact(self):
+        """Drop tombstoned documents and renumber the rest."""
+        if not self._deleted:
+            return
+        remap = {}
+        doc_len = array("I")
+        doc_keys = []
+        for old_id, key in enumerate(self._doc_keys):
+            if old_id in self._deleted:
+                continue
+            remap[old_id] = len(doc_keys)
+            doc_keys.append(key)
+            doc_len.append(self._doc_len[old_id])
+
+        postings = {}
+        for term, (docs, tfs, _) in self._postings.items():
+            new_docs, new_tfs = array("I"), array("I")
+            for doc_id, tf in zip(docs, tfs):
+                new_id = remap.get(doc_id)
+                if new_id is not None:
+                    new_docs.append(new_id)
+                    new_tfs.append(tf)
+            if new_docs:
+                postings[term] = [new_docs, new_tfs, max(new_tfs)]
+
+        self._postings = postings
+        self._doc_len = doc_len
+        self._doc_keys = doc_keys
+        self._key_to_doc = {key: i for i, key in enumerate(doc_keys)}
+        self._deleted = set()
+        self._total_len = sum(doc_len)
+        self._min_len = min((n for n in doc_len if n), default=None)
+
+    # -----------------------------
+    # 🔹 Search
+    # -----------------------------
+    def _idf(self, df):
+        n = len(self._doc_keys)
+        return math.log(1 + (n - df + 0.5) / (df + 0.5))
+
+    def search(self, query_terms, k=10):
+        """Top-k (key, score) for the query terms, best first."""
+        if not self._key_to_doc or k <= 0:
+            return []
+        avgdl = self._total_len / len(self._doc_keys) or 1.0
+        k1, b = self.k1, self.b
+        doc_len = self._doc_len
+        deleted = self._deleted
+
+        # Per-term cursor state: [docs, tfs, idf, upper bound, position]
+        terms = []
+        for term in set(query_terms):
+            entry = self._postings.get(term)
+            if entry is None:
+                continue
+            docs, tfs, max_tf = entry
+            idf = self._idf(len(docs))
+            norm = k1 * (1 - b + b * (self._min_len or 0) / avgdl)
+            upper = idf * max_tf * (k1 + 1) / (max_tf + norm)
+            terms.append([docs, tfs, idf, upper, 0])
+        if not terms:
+            return []
+
+        # Ascending upper bounds; prefix[i] = sum of upper bounds of terms[:i]
+        terms.sort(key=lambda t: t[3])
+        prefix = [0.0]
+        for t in terms:
+            prefix.append(prefix[-1] + t[3])
+
+        heap = []              # (score, -doc_id) min-heap of the current top-k
+        threshold = 0.0
+        first_essential = 0    # terms[:first_essential] are non-essential
+
+        while True:
+            essential = terms[first_essential:]
+            candidate = min(
+                (t[0][t[4]] for t in essential if t[4] < len(t[0])), default=None
+            )
+            if candidate is None:
+                break
+
+            dl_norm = k1 * (1 - b + b * doc_len[candidate] / avgdl)
+            score = 0.0
+            for t in essential:
+                pos = t[4]
+                if pos < len(t[0]) and t[0][pos] == candidate:
+                    tf = t[1][pos]
+                    score += t[2] * tf * (k1 + 1) / (tf + dl_norm)
+                    t[4] = pos + 1
+
+            if candidate in deleted:
+                continue
+
+            # Probe non-essential terms, best first, while they can still matter
+            for i in range(first_essential - 1, -1, -1):
+                if len(heap) == k and score + prefix[i + 1] <= threshold:
+                    break
+                t = terms[i]
+                pos = bisect_left(t[0], candidate, t[4])
+                t[4] = pos
+                if pos < len(t[0]) and t[0][pos] == candidate:
+                    tf = t[1][pos]
+                    score += t[2] * tf * (k1 + 1) / (tf + dl_norm)
+
+            if len(heap) < k:
+                heapq.heappush(heap, (score, -candidate))
+            elif score > threshold:
+                heapq.heapreplace(heap, (score, -candidate))
+            else:
+                continue
+
+            if len(heap) == k:
+                threshold = heap[0][0]
+                while first_essential < len(terms) and prefix[first_essential + 1] <= threshold:
+                    first_essential += 1
+
+        ranked = sorted(heap, key=lambda item: (-item[0], -item[1]))
+        return [(self._doc_keys[-neg_id], score) for score, neg_id in ranked]
+
+    # -----------------------------
+    # 🔹 Snapshots
+    # -----------------------------
+    def save(self, path):
+        """Write a snapshot of the index (atomically replaces path)."""
+        state = {
+            "format_version": SNAPSHOT_FORMAT_VERSION,
+            "k1": self.k1,
+            "b": self.b,
+            "postings": self._postings,
+            "doc_len": self._doc_len,
+            "doc_keys": self._doc_keys,
+            "deleted": sorted(self._deleted),
+        }
+        with atomic_write(path) as f:
+            pickle.dump(state, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+    @classmethod
+    def load(cls, path):
+        """
+        Restore an index written by save(). Snapshots are pickles, which can
+        run code when loaded: only load files this pipeline wrote.
+        """
+        with open(path, "rb") as f:
+            state = pickle.load(f)
+        if state.get("format_version") != SNAPSHOT_FORMAT_VERSION:
+            raise ValueError(f"Unsupported BM25 snapshot format in {path}")
+
+        index = cls(k1=state["k1"], b=state["b"])
+        index._postings = state["postings"]
+        index._doc_len = state["doc_len"]
+        index._doc_keys = state["doc_keys"]
+        index._deleted = set(state["deleted"])
+        index._key_to_doc = {
+            key: i for i, key in enumerate(index._doc_keys) if i not in index._deleted
+        }
+        index._total_len = sum(index._doc_len)
+        index._min_len = min((n for n in index._doc_len if n), default=None)
+        return index
+
+
+def open_index(path, **kwargs):
+    """Load the snapshot at path if it exists, else start an empty index."""
+    if path and os.path.exists(path):
+        return BM25Index.load(path)
+    return BM25Index(**kwargs)
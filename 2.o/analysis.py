@@ -0,0 +1,251 @@
+import hashlib
+import threading
+from array import array
+from collections import OrderedDict
+from itertools import islice
+
+from nlp_models import model_identity, pipe_stage, resolve_model, run_stage
+from NER import build_structured_data, find_keyword_hits, match_keywords
+from offset_map import iter_spans, join_tokens
+from pipeline_graph import PipelineGraph
+from skill_taxonomy import taxonomy_version
+
+# -----------------------------
+# 🔹 Single-pass document analysis
+# -----------------------------
+# One spaCy run per document. Tokenization, parsing and NER are all views
+# over the same Doc, so a resume goes through the transformer once instead
+# of three times.
+#
+# The per-document stages form a PipelineGraph: the spaCy pass is keyed by
+# text and model version only (and persisted on disk), keyword matching by the
+# tokens and the taxonomy version, so reloading the skill taxonomy re-runs
+# keyword matching and NER assembly but never the transformer.
+#
+# Positions are carried alongside the values: tokens come with flat
+# [start, end, ...] spans into the normalized text, and keyword hits and
+# entities carry spans in the same coordinates. Normalizing raw text also
+# yields an OffsetMap back to it, so any of these can be located in the
+# extracted document (see source_offsets / locate_keywords).
+
+ANALYSIS_CACHE_SIZE = 32
+ANALYSIS_OUTPUTS = ("tokens", "token_spans", "parse", "entities", "keywords", "keyword_hits",
+                    "keyword_spans", "ner")
+
+_analysis_cache = OrderedDict()
+_cache_lock = threading.Lock()
+
+DOCUMENT_GRAPH = PipelineGraph("document", fingerprinters={"model": model_identity})
+
+
+def _cache_key(text, model_name):
+    # The model and taxonomy versions are part of the key so an upgrade or a
+    # reload invalidates results
+    return (model_identity(model_name), taxonomy_version(), hashlib.sha256(text.encode("utf-8")).hexdigest())
+
+
+def token_texts(doc):
+    """Token texts without spaces/punctuation (what tokenize_text returns)."""
+    return [token.text for token in doc if not (token.is_space or token.is_punct)]
+
+
+def token_spans(doc):
+    """Flat [start, end, ...] character spans of the token_texts tokens."""
+    spans = array("I")
+    for token in doc:
+        if not (token.is_space or token.is_punct):
+            spans.extend((token.idx, token.idx + len(token.text)))
+    return spans
+
+
+def parse_rows(doc):
+    """(text, POS, dep, head) rows for every token (what parse_text returns)."""
+    return [(token.text, token.pos_, token.dep_, token.head.text) for token in doc]
+
+
+def _spacy_outputs(doc):
+    return {
+        "tokens": token_texts(doc),
+        "token_spans": token_spans(doc),
+        "parse": parse_rows(doc),
+        "entities": [
+            {"text": ent.text, "label": ent.label_, "start": ent.start_char, "end": ent.end_char}
+            for ent in doc.ents
+        ],
+    }
+
+
+# -----------------------------
+# 🔹 Document stages
+# -----------------------------
+
+@DOCUMENT_GRAPH.stage(inputs=("text",), outputs=("normalized_text", "offset_map"), version="3")
+def normalize(text):
+    from normalization import normalize_with_offsets
+    normalized_text, offset_map = normalize_with_offsets(text)
+    return {"normalized_text": normalized_text, "offset_map": offset_map}
+
+
+@DOCUMENT_GRAPH.stage(inputs=("normalized_text", "model"),
+                      outputs=("tokens", "token_spans", "parse", "entities"), version="2", persist=True)
+def spacy_pass(normalized_text, model):
+    return _spacy_outputs(run_stage(normalized_text, "analysis", model))
+
+
+@DOCUMENT_GRAPH.stage(inputs=("tokens",), outputs=("keyword_text", "keywords", "keyword_hits"),
+                      depends=(taxonomy_version,))
+def keyword_matching(tokens):
+    # Keyword matching runs on the lowercased token stream, as NER always did
+    keyword_text = " ".join(tokens).lower()
+    keyword_hits = match_keywords(keyword_text)
+    return {
+        "keyword_text": keyword_text,
+        "keywords": find_keyword_hits(keyword_text, keyword_hits),
+        "keyword_hits": [hit._asdict() for hit in keyword_hits],
+    }
+
+
+@DOCUMENT_GRAPH.stage(inputs=("tokens", "token_spans", "keyword_hits"), outputs=("keyword_spans",))
+def keyword_offsets(tokens, token_spans, keyword_hits):
+    # Hit offsets point into the lowercased token stream; map them back
+    # through the token spans into the normalized text
+    _, offsets = join_tokens(tokens, token_spans, str.lower)
+    spans = array("I")
+    for hit in keyword_hits:
+        spans.extend(offsets.span_to_source(hit["start"], hit["end"]))
+    return {"keyword_spans": spans}
+
+
+@DOCUMENT_GRAPH.stage(inputs=("entities", "keywords", "keyword_text"), outputs=("ner",))
+def structured_ner(entities, keywords, keyword_text):
+    return {"ner": build_structured_data(entities, keywords, keyword_text)}
+
+
+@DOCUMENT_GRAPH.stage(inputs=("tokens", "token_spans"), outputs=("content_tokens", "content_spans"),
+                      version="2")
+def stopword_removal(tokens, token_spans):
+    from stop_word_removal import filter_stopwords_with_spans
+    content_tokens, content_spans = filter_stopwords_with_spans(tokens, token_spans)
+    return {"content_tokens": content_tokens, "content_spans": content_spans}
+
+
+@DOCUMENT_GRAPH.stage(inputs=("offset_map", "token_spans", "content_spans", "keyword_spans", "entities"),
+                      outputs=("source_spans",))
+def source_offsets(offset_map, token_spans, content_spans, keyword_spans, entities):
+    # Only reachable from raw text, the offset map comes from normalization:
+    #   DOCUMENT_GRAPH.run(["source_spans"], text=raw_text, model=model_name)
+    entity_spans = array("I")
+    for ent in entities:
+        entity_spans.extend((ent["start"], ent["end"]))
+    return {"source_spans": {
+        "tokens": offset_map.spans_to_source(token_spans),
+        "content_tokens": offset_map.spans_to_source(content_spans),
+        "keywords": offset_map.spans_to_source(keyword_spans),
+        "entities": offset_map.spans_to_source(entity_spans),
+    }}
+
+
+def locate_keywords(analysis, offset_map=None, label="SKILLS"):
+    """
+    {keyword: [(start, end), ...]} for every keyword hit with the given
+    label in an analyze_document() result. Positions are in the analyzed
+    (normalized) text, or in the original text when the OffsetMap from
+    normalize_with_offsets is given. No NLP is re-run.
+    """
+    located = {}
+    for hit, span in zip(analysis["keyword_hits"], iter_spans(analysis["keyword_spans"])):
+        if hit["label"] == label:
+            if offset_map is not None:
+                span = offset_map.span_to_source(*span)
+            located.setdefault(hit["keyword"], []).append(tuple(span))
+    return located
+
+
+def _spacy_fingerprint(text, model_name):
+    fingerprints = DOCUMENT_GRAPH.input_fingerprints({"normalized_text": text, "model": model_name})
+    return DOCUMENT_GRAPH.fingerprint(DOCUMENT_GRAPH.stages["spacy_pass"], fingerprints)
+
+
+def analyze_document(text, model_name=None):
+    """
+    Run the spaCy pipeline once over text and return every stage output:
+      tokens   - token texts without spaces/punctuation (tokenize_text)
+      token_spans - flat [start, end, ...] character spans of the tokens
+      parse    - (text, POS, dep, head) rows for every token (parse_tokens)
+      entities - spaCy entities with label and character offsets
+      keywords - dictionary keyword hits per structured field
+      keyword_hits - every keyword hit with offsets into the keyword text
+      keyword_spans - flat character spans of keyword_hits in text
+      ner      - structured NER dict (perform_full_ner)
+    model_name may be a model or a tier (see nlp_models.MODEL_TIERS).
+    Results for recently analyzed texts are reused without re-running spaCy;
+    the spaCy pass itself is also kept in the persistent result cache.
+    """
+    model_name = resolve_model(model_name, "analysis")
+    key = _cache_key(text, model_name)
+    with _cache_lock:
+        hit = _analysis_cache.get(key)
+        if hit is not None:
+            _analysis_cache.move_to_end(key)
+            return hit
+
+    result = _analyze_stages(text, model_name, key)
+    _remember(key, result)
+    return result
+
+
+def _analyze_stages(text, model_name, key):
+    outputs = DOCUMENT_GRAPH.run(ANALYSIS_OUTPUTS, normalized_text=text, model=model_name)
+    return {"model": model_name, "taxonomy_version": key[1], "text_sha256": key[2], **outputs}
+
+
+def _remember(key, result):
+    with _cache_lock:
+        _analysis_cache[key] = result
+        while len(_analysis_cache) > ANALYSIS_CACHE_SIZE:
+            _analysis_cache.popitem(last=False)
+
+
+def iter_analyze_documents(texts, model_name=None, batch_size=32, n_process=1):
+    """
+    analyze_document() for many texts, yielded in input order. Texts whose
+    spaCy pass is memoized skip it; the rest are streamed through nlp.pipe
+    in batches (over n_process worker processes), which is far cheaper per
+    document than one call each, especially for transformer models.
+    Texts are consumed a chunk at a time, so any iterable works.
+    """
+    model_name = resolve_model(model_name, "analysis")
+    texts = iter(texts)
+    chunk_size = batch_size * max(n_process, 1) * 4
+
+    while True:
+        chunk = list(islice(texts, chunk_size))
+        if not chunk:
+            break
+        keys = [_cache_key(text, model_name) for text in chunk]
+        with _cache_lock:
+            results = [_analysis_cache.get(key) for key in keys]
+
+        fingerprints = {i: _spacy_fingerprint(chunk[i], model_name)
+                        for i, result in enumerate(results) if result is None}
+        missing = [i for i, fp in fingerprints.items() if DOCUMENT_GRAPH.lookup("spacy_pass", fp) is None]
+        docs = pipe_stage(
+            (chunk[i] for i in missing), "analysis", model_name,
+            batch_size=batch_size, n_process=n_process,
+        )
+        for i, doc in zip(missing, docs):
+            DOCUMENT_GRAPH.store("spacy_pass", fingerprints[i], _spacy_outputs(doc))
+            results[i] = _analyze_stages(chunk[i], model_name, keys[i])
+        for i in fingerprints:
+            if results[i] is None:
+                results[i] = _analyze_stages(chunk[i], model_name, keys[i])
+
+        for key, result in zip(keys, results):
+            _remember(key, result)
+            yield result
+
+
+def clear_analysis_cache():
+    with _cache_lock:
+        _analysis_cache.clear()
+    DOCUMENT_GRAPH.clear()
@@ -0,0 +1,36 @@
+import os
+import tempfile
+from contextlib import contextmanager
+
+# -----------------------------
+# 🔹 Atomic file writes
+# -----------------------------
+# Indexes, NER artifacts and snapshots are written to a temp file in the
+# target's directory and renamed over it, so a reader never sees a half-
+# written file. Every writer gets its own temp file (tempfile.mkstemp), so
+# two processes or two threads (e.g. Streamlit sessions) saving the same
+# path at once cannot corrupt each other's output; the last rename wins.
+#
+#   with atomic_write("index.bin") as f:
+#       f.write(data)
+
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+
+
+@contextmanager
+def atomic_write(path, mode="wb"):
+    """Write to a temp file that replaces path when the block succeeds (and is removed if not)."""
+    fd, tmp_path = tempfile.mkstemp(
+        prefix=os.path.basename(path) + ".", suffix=".tmp",
+        dir=os.path.dirname(os.path.abspath(path)),
+    )
+    try:
+        os.chmod(tmp_path, 0o666 & ~_UMASK)   # mkstemp files are private (0600)
+        with os.fdopen(fd, mode) as f:
+            yield f
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        raise
@@ -0,0 +1,123 @@
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+from nlp_models import MODEL_TIERS, STAGE_DISABLE, get_nlp, model_stats, run_stage
+
+# -----------------------------
+# 🔹 Model tier benchmark
+# -----------------------------
+# Measures every tier in a fresh process (so memory numbers don't overlap):
+# model load time, resident memory added by the model, and per-document
+# latency of each stage profile on the sample resume/JD texts.
+#
+#   python benchmark_model_tiers.py              # all installed tiers
+#   python benchmark_model_tiers.py --markdown   # table for the README
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+SAMPLE_FILES = [
+    os.path.join(HERE, "preprocessing_output_CV", "extracted_text.txt"),
+    os.path.join(HERE, "preprocessing_output_JD", "extracted_text.txt"),
+]
+
+
+def load_samples(paths):
+    texts = []
+    for path in paths:
+        if os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as f:
+                texts.append(f.read())
+    return texts
+
+
+def measure_tier(tier, texts, repeat):
+    """Load the tier's model and time every stage; returns a stats dict."""
+    model = MODEL_TIERS[tier]
+    try:
+        get_nlp(model)
+    except OSError as e:
+        return {"tier": tier, "model": model, "error": str(e).splitlines()[0]}
+
+    loaded = model_stats()["models"][0]
+    result = {
+        "tier": tier,
+        "model": model,
+        "load_seconds": loaded["load_seconds"],
+        "rss_mb": round(loaded["rss_delta_bytes"] / 1e6, 1) if loaded["rss_delta_bytes"] else None,
+        "stages": {},
+    }
+    for stage in STAGE_DISABLE:
+        for text in texts:   # warm-up
+            run_stage(text, stage, model)
+        latencies = []
+        for _ in range(repeat):
+            for text in texts:
+                start = time.perf_counter()
+                run_stage(text, stage, model)
+                latencies.append((time.perf_counter() - start) * 1000)
+        result["stages"][stage] = round(statistics.median(latencies), 2)
+    return result
+
+
+def run_in_subprocess(tier, args):
+    command = [sys.executable, os.path.abspath(__file__), "--worker", tier, "--repeat", str(args.repeat)]
+    for path in args.samples:
+        command += ["--sample", path]
+    output = subprocess.run(command, capture_output=True, text=True, cwd=os.getcwd())
+    for line in reversed(output.stdout.splitlines()):
+        if line.startswith("{"):
+            return json.loads(line)
+    return {"tier": tier, "model": MODEL_TIERS[tier], "error": output.stderr.strip()[-200:] or "no output"}
+
+
+def format_table(results, markdown=False):
+    stages = list(STAGE_DISABLE)
+    header = ["tier", "model", "load (s)", "RSS (MB)"] + [f"{s} (ms/doc)" for s in stages]
+    rows = []
+    for r in results:
+        if "error" in r:
+            rows.append([r["tier"], r["model"], "not installed"] + [""] * (len(header) - 3))
+        else:
+            rows.append([r["tier"], r["model"], r["load_seconds"], r["rss_mb"]]
+                        + [r["stages"][s] for s in stages])
+    if markdown:
+        lines = ["| " + " | ".join(header) + " |", "|" + "---|" * len(header)]
+        lines += ["| " + " | ".join(str(c) for c in row) + " |" for row in rows]
+        return "\n".join(lines)
+    widths = [max(len(str(c)) for c in col) for col in zip(header, *rows)]
+    return "\n".join(
+        "  ".join(str(c).ljust(w) for c, w in zip(row, widths)) for row in [header] + rows
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark spaCy model tiers per stage")
+    parser.add_argument("tiers", nargs="*", default=list(MODEL_TIERS))
+    parser.add_argument("--sample", dest="samples", action="append", default=None,
+                        help="text file to benchmark on (default: the sample resume and JD)")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--markdown", action="store_true")
+    parser.add_argument("--worker", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    args.samples = args.samples or SAMPLE_FILES
+
+    texts = load_samples(args.samples)
+    if not texts:
+        print("⚠️ No sample texts found")
+        return
+
+    if args.worker:
+        print(json.dumps(measure_tier(args.worker, texts, args.repeat)))
+        return
+
+    print(f"📄 {len(texts)} sample documents, {sum(len(t) for t in texts)} chars, repeat={args.repeat}")
+    results = [run_in_subprocess(tier, args) for tier in args.tiers]
+    print(format_table(results, markdown=args.markdown))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,155 @@
+import argparse
+import os
+import random
+import re
+import time
+from collections import Counter
+
+from normalization import normalize_corpus, normalize_text
+
+# -----------------------------
+# 🔹 Normalizer benchmark
+# -----------------------------
+# Times the single-pass normalize_text against the previous two-regex
+# version on a large synthetic corpus and reports how the outputs differ.
+# Each document is a run of lines from one of the sample texts, starting
+# at a random line with a random length and skipping a random fifth of
+# the lines. Half the documents are ASCII-only; the other half get
+# bullets and lines with tech symbols, non-ASCII names and punctuation
+# mixed in. The corpus is seeded, so runs are comparable.
+#
+#   python benchmark_normalization.py --mb 50
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+SAMPLE_FILES = [
+    os.path.join(HERE, "preprocessing_output_CV", "extracted_text.txt"),
+    os.path.join(HERE, "preprocessing_output_JD", "extracted_text.txt"),
+    os.path.join(HERE, "Rewriter", "Resume_Enhancement_Report.txt"),
+]
+EXTRA_LINES = [
+    "Built services in C++17, C# and .NET; frontend in Node.js (React).",
+    "José Müller – Senior Engineer @ Zürich | python/sql | 50% faster builds",
+    "Skills: F#, g++, Go, R, AWS — CI/CD #devops",
+    "Led the “Résumé Parser” rewrite: 3× faster, 40% less memory",
+    "François Lefèvre · Kraków · +48 600 123 456 · f.lefevre@example.com",
+    "Tools: Git, Docker, Kubernetes, Terraform ★ certified (2023)",
+    "北京大学 — B.Sc. Computer Science, GPA 3.8/4.0",
+    "Optimised Spark jobs ⇒ cut cloud spend by €12k/yr; mentored 4 engineers",
+]
+BULLETS = ["• ", "▪ ", "– ", "- ", "* ", ""]
+
+
+def legacy_normalize_text(text):
+    """The previous implementation (two regex passes, ASCII only)."""
+    text = re.sub(r'[^a-zA-Z0-9\s\.\,\-\(\)]', ' ', text)
+    text = re.sub(r'\s+', ' ', text)
+    return text.strip()
+
+
+def _sample_lines():
+    samples = []
+    for path in SAMPLE_FILES:
+        if os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as f:
+                lines = [line for line in f.read().splitlines() if line.strip()]
+            if lines:
+                samples.append(lines)
+    return samples or [EXTRA_LINES]
+
+
+def build_corpus(megabytes, seed=0, min_chars=800, max_chars=8000):
+    """
+    {"ascii": [...], "mixed": [...]} documents totalling about megabytes
+    characters. Every document is assembled separately (sample file, start
+    line and length drawn at random), so they are all different.
+    """
+    rng = random.Random(seed)
+    samples = _sample_lines()
+    corpus = {"ascii": [], "mixed": []}
+    total = 0
+    while total < megabytes * 1e6:
+        kind = "mixed" if len(corpus["ascii"]) > len(corpus["mixed"]) else "ascii"
+        lines = rng.choice(samples)
+        position = rng.randrange(len(lines))
+        target = rng.randint(min_chars, max_chars)
+        doc, size = [], 0
+        while size < target:
+            if kind == "mixed" and rng.random() < 0.15:
+                line = rng.choice(BULLETS) + rng.choice(EXTRA_LINES)
+            else:
+                # Skipping the odd line keeps documents from repeating
+                position += 1 + (rng.random() < 0.2)
+                line = lines[position % len(lines)]
+                if kind == "mixed":
+                    line = rng.choice(BULLETS) + line
+            doc.append(line)
+            size += len(line) + 1
+        text = "\n".join(doc)
+        if kind == "ascii":
+            text = text.encode("ascii", "ignore").decode("ascii")
+        corpus[kind].append(text)
+        total += len(text)
+    return corpus
+
+
+def time_it(fn, docs, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for doc in docs:
+            fn(doc)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def behavior_diff(docs):
+    """Tokens produced only by the new or only by the old normalizer."""
+    gained, lost = Counter(), Counter()
+    differing = 0
+    for doc in set(docs):
+        old, new = legacy_normalize_text(doc), normalize_text(doc)
+        if old != new:
+            differing += 1
+            old_tokens, new_tokens = Counter(old.split()), Counter(new.split())
+            gained.update(new_tokens - old_tokens)
+            lost.update(old_tokens - new_tokens)
+    return differing, gained, lost
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark normalize_text against the regex version")
+    parser.add_argument("--mb", type=float, default=20.0, help="corpus size in MB")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0, help="corpus seed")
+    parser.add_argument("--n-process", type=int, default=1, help="also time normalize_corpus with N processes")
+    args = parser.parse_args()
+
+    corpus = build_corpus(args.mb, args.seed)
+    corpus["all"] = corpus["ascii"] + corpus["mixed"]
+    for kind in ("ascii", "mixed", "all"):
+        docs = corpus[kind]
+        size_mb = sum(len(d) for d in docs) / 1e6
+        legacy = time_it(legacy_normalize_text, docs, args.repeat)
+        single = time_it(normalize_text, docs, args.repeat)
+        print(f"📄 {kind}: {len(docs)} documents ({len(set(docs))} distinct), {size_mb:.1f}M chars")
+        print(f"  legacy (2 regex passes): {legacy:.3f}s  {size_mb / legacy:.1f} Mchar/s")
+        print(f"  single pass:             {single:.3f}s  {size_mb / single:.1f} Mchar/s  ({legacy / single:.1f}x)")
+
+    if args.n_process > 1:
+        docs = corpus["all"]
+        size_mb = sum(len(d) for d in docs) / 1e6
+        start = time.perf_counter()
+        for _ in normalize_corpus(docs, n_process=args.n_process):
+            pass
+        bulk = time.perf_counter() - start
+        print(f"normalize_corpus x{args.n_process}: {bulk:.3f}s  {size_mb / bulk:.1f} Mchar/s")
+
+    for kind in ("ascii", "mixed"):
+        differing, gained, lost = behavior_diff(corpus[kind])
+        print(f"\nBehavior diff ({kind}): {differing} of {len(set(corpus[kind]))} distinct documents differ")
+        print(f"  only in new output: {dict(gained.most_common(10))}")
+        print(f"  only in old output: {dict(lost.most_common(10))}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+import argparse
+import glob
+import os
+import re
+import time
+from collections import Counter
+
+from pdf_extraction import DEFAULT_BACKENDS, available_backends, iter_pdf_pages
+
+# -----------------------------
+# 🔹 PDF backend benchmark
+# -----------------------------
+# Compares PyMuPDF and pdfplumber on a sample corpus: extraction throughput
+# from in-memory bytes (the way uploads are processed) and how closely the
+# two backends agree on the extracted words.
+#
+#   python benchmark_pdf_backends.py                  # PDFs in this repo
+#   python benchmark_pdf_backends.py "resumes/*.pdf" --repeat 3
+
+_WORD_RE = re.compile(r"\w+")
+
+
+def _words(text):
+    return _WORD_RE.findall(text.lower())
+
+
+def word_overlap(a, b):
+    """Dice overlap of the two word multisets (1.0 = same words, any order)."""
+    ca, cb = Counter(_words(a)), Counter(_words(b))
+    total = sum(ca.values()) + sum(cb.values())
+    if not total:
+        return 1.0
+    return 2 * sum((ca & cb).values()) / total
+
+
+def benchmark_backend(backend, documents, repeat=1):
+    """Extract every document repeat times; returns throughput stats and texts."""
+    texts, failures, pages = {}, {}, 0
+    start = time.perf_counter()
+    for _ in range(repeat):
+        pages = 0
+        for path, data in documents.items():
+            try:
+                page_texts = list(iter_pdf_pages(data, backend))
+            except Exception as e:
+                failures[path] = f"{type(e).__name__}: {e}"
+                continue
+            pages += len(page_texts)
+            texts[path] = "".join(page_texts)
+    seconds = (time.perf_counter() - start) / repeat
+    megabytes = sum(len(d) for d in documents.values()) / 1e6
+    return {
+        "backend": backend,
+        "files": len(documents) - len(failures),
+        "failed": len(failures),
+        "pages": pages,
+        "seconds": seconds,
+        "pages_per_sec": pages / seconds if seconds else 0.0,
+        "mb_per_sec": megabytes / seconds if seconds else 0.0,
+    }, texts, failures
+
+
+def main():
+    here = os.path.dirname(os.path.abspath(__file__))
+    parser = argparse.ArgumentParser(description="Benchmark PDF extraction backends")
+    parser.add_argument("source", nargs="?", default=os.path.join(here, "..", "**", "*.pdf"),
+                        help="glob of PDFs (default: the sample PDFs in this repo)")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--max-files", type=int, default=None)
+    args = parser.parse_args()
+
+    paths = sorted(glob.glob(args.source, recursive=True))[:args.max_files]
+    if not paths:
+        print(f"⚠️ No PDFs match {args.source}")
+        return
+    documents = {}
+    for path in paths:
+        with open(path, "rb") as f:
+            documents[os.path.relpath(path)] = f.read()
+
+    backends = available_backends()
+    missing = [b for b in DEFAULT_BACKENDS if b not in backends]
+    print(f"📄 {len(documents)} PDFs, {sum(len(d) for d in documents.values()) / 1e6:.2f} MB, "
+          f"repeat={args.repeat}" + (f" (not installed: {', '.join(missing)})" if missing else ""))
+
+    results = {}
+    print(f"\n{'backend':<12}{'files':>7}{'failed':>8}{'pages':>7}{'sec/run':>10}{'pages/s':>10}{'MB/s':>8}")
+    for backend in backends:
+        stats, texts, failures = benchmark_backend(backend, documents, args.repeat)
+        results[backend] = texts
+        print(f"{backend:<12}{stats['files']:>7}{stats['failed']:>8}{stats['pages']:>7}"
+              f"{stats['seconds']:>10.4f}{stats['pages_per_sec']:>10.1f}{stats['mb_per_sec']:>8.2f}")
+        for path, error in failures.items():
+            print(f"   ⚠️ {path}: {error}")
+
+    if len(results) == 2:
+        a, b = DEFAULT_BACKENDS
+        common = sorted(set(results[a]) & set(results[b]))
+        overlaps = {p: word_overlap(results[a][p], results[b][p]) for p in common}
+        if overlaps:
+            mean = sum(overlaps.values()) / len(overlaps)
+            print(f"\nParity ({a} vs {b}, word overlap): mean {mean:.3f}, "
+                  f"min {min(overlaps.values()):.3f} over {len(overlaps)} files")
+            for path, score in sorted(overlaps.items(), key=lambda item: item[1])[:5]:
+                print(f"   {score:.3f}  {path}")
+
+
+if __name__ == "__main__":
+    main()
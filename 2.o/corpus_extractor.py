@@ -0,0 +1,222 @@
+import glob
+import multiprocessing
+import os
+import time
+from multiprocessing.connection import wait
+
+# -----------------------------
+# 🔹 Parallel corpus PDF extraction
+# -----------------------------
+# Fans PDF extraction out over a pool of worker processes and yields
+# (path, text, stats) as each file finishes. Every worker has its own pipe,
+# so a worker that crashes on a corrupt PDF or exceeds the per-file timeout
+# is killed and replaced without affecting the others. Paths are consumed
+# lazily and at most one result per worker is in flight, so memory stays
+# flat however large the folder is.
+#
+# Workers are started with forkserver (spawn where that is unavailable),
+# never forked from the caller: pipeline_cli.py has a spaCy/torch model
+# and its thread pools loaded by the time extraction starts, and every
+# worker (and every recycled one) would otherwise be a fork of that.
+
+DEFAULT_TIMEOUT = 60.0
+MAX_TASKS_PER_WORKER = 200   # recycle workers to bound native-library leaks
+
+
+def worker_context():
+    """Multiprocessing context whose workers start from a clean interpreter."""
+    methods = multiprocessing.get_all_start_methods()
+    return multiprocessing.get_context("forkserver" if "forkserver" in methods else "spawn")
+
+
+def extract_pdf_with_stats(pdf_path):
+    """Default extractor: full PDF text plus page count and backend used."""
+    from pdf_extraction import extract_pdf_text
+
+    stats = {}
+    text = extract_pdf_text(pdf_path, stats=stats)
+    return text, {"pages": stats["pages"], "backend": stats["backend"]}
+
+
+def iter_pdf_paths(source):
+    """PDF paths from a folder, a glob pattern, or an iterable of paths (lazily)."""
+    if isinstance(source, str):
+        if os.path.isdir(source):
+            with os.scandir(source) as entries:
+                for entry in entries:
+                    if entry.is_file() and entry.name.lower().endswith(".pdf"):
+                        yield entry.path
+        else:
+            yield from glob.iglob(source, recursive=True)
+    else:
+        yield from source
+
+
+def _worker_main(conn, extract_fn):
+    """Worker loop: receive a path, send back (path, text, stats)."""
+    while True:
+        try:
+            path = conn.recv()
+        except EOFError:
+            break
+        if path is None:
+            break
+        start = time.perf_counter()
+        stats = {"worker_pid": os.getpid(), "error": None}
+        try:
+            result = extract_fn(path)
+            if isinstance(result, tuple):
+                text, extra = result
+                stats.update(extra or {})
+            else:
+                text = result
+        except Exception as e:
+            text = ""
+            stats["error"] = f"{type(e).__name__}: {e}"
+        stats["chars"] = len(text)
+        stats["seconds"] = round(time.perf_counter() - start, 4)
+        conn.send((path, text, stats))
+
+
+class _Worker:
+    def __init__(self, ctx, extract_fn):
+        self.conn, child_conn = ctx.Pipe()
+        self.process = ctx.Process(target=_worker_main, args=(child_conn, extract_fn), daemon=True)
+        self.process.start()
+        child_conn.close()
+        self.path = None
+        self.started = None
+        self.tasks_done = 0
+
+    def assign(self, path):
+        self.path = path
+        self.started = time.monotonic()
+        self.conn.send(path)
+
+    def release(self):
+        self.path = None
+        self.started = None
+        self.tasks_done += 1
+
+    def stop(self, force=False):
+        if not force:
+            try:
+                self.conn.send(None)
+            except (OSError, BrokenPipeError):
+                force = True
+        if force:
+            self.process.terminate()
+        self.process.join(timeout=1)
+        if self.process.is_alive():
+            self.process.kill()
+            self.process.join()
+        self.conn.close()
+
+
+def _failure(path, message, started):
+    return path, "", {
+        "worker_pid": None,
+        "error": message,
+        "chars": 0,
+        "seconds": round(time.monotonic() - started, 4),
+    }
+
+
+def iter_corpus_texts(source, workers=None, timeout=DEFAULT_TIMEOUT,
+                      extract_fn=extract_pdf_with_stats,
+                      max_tasks_per_worker=MAX_TASKS_PER_WORKER):
+    """
+    Extract every PDF in source (folder, glob or iterable of paths) in
+    parallel and yield (path, text, stats) in completion order. stats holds
+    pages/chars/seconds/worker_pid and "error" (None on success); crashed or
+    timed-out files are reported with empty text instead of raising.
+    extract_fn must be a picklable top-level function: path -> text or
+    (text, extra_stats).
+    """
+    ctx = worker_context()
+    n_workers = workers or os.cpu_count() or 1
+    paths = iter_pdf_paths(source)
+    pool = [_Worker(ctx, extract_fn) for _ in range(n_workers)]
+    exhausted = False
+
+    try:
+        while True:
+            # Hand out work to idle workers
+            for worker in pool:
+                if worker.path is None and not exhausted:
+                    path = next(paths, None)
+                    if path is None:
+                        exhausted = True
+                    else:
+                        worker.assign(path)
+
+            busy = [w for w in pool if w.path is not None]
+            if not busy:
+                break
+
+            now = time.monotonic()
+            wait_for = max(0.0, min(w.started + timeout for w in busy) - now) if timeout else None
+            ready = wait(
+                [w.conn for w in busy] + [w.process.sentinel for w in busy], timeout=wait_for
+            )
+
+            for i, worker in enumerate(pool):
+                if worker.path is None:
+                    continue
+                failure = None
+                if worker.conn in ready:
+                    try:
+                        path, text, stats = worker.conn.recv()
+                    except (EOFError, OSError):
+                        failure = "worker crashed"
+                    else:
+                        worker.release()
+                        yield path, text, stats
+                        if worker.tasks_done >= max_tasks_per_worker:
+                            worker.stop()
+                            pool[i] = _Worker(ctx, extract_fn)
+                        continue
+                elif worker.process.sentinel in ready or not worker.process.is_alive():
+                    worker.process.join(timeout=1)
+                    failure = f"worker crashed (exit code {worker.process.exitcode})"
+                elif timeout and time.monotonic() - worker.started > timeout:
+                    failure = f"timed out after {timeout}s"
+
+                if failure:
+                    # Kill and replace the worker; the file is reported as failed
+                    result = _failure(worker.path, failure, worker.started)
+                    worker.stop(force=True)
+                    pool[i] = _Worker(ctx, extract_fn)
+                    yield result
+    finally:
+        for worker in pool:
+            worker.stop(force=worker.path is not None)
+
+
+def extract_corpus(source, output_dir=None, **kwargs):
+    """
+    Run iter_corpus_texts over source, optionally writing each text to
+    <output_dir>/<pdf name>.txt, and return a summary of the run.
+    """
+    if output_dir:
+        os.makedirs(output_dir, exist_ok=True)
+    summary = {"files": 0, "failed": 0, "chars": 0, "seconds": 0.0}
+    start = time.perf_counter()
+    for path, text, stats in iter_corpus_texts(source, **kwargs):
+        summary["files"] += 1
+        summary["chars"] += stats["chars"]
+        if stats["error"]:
+            summary["failed"] += 1
+            print(f"⚠️ {path}: {stats['error']}")
+            continue
+        if output_dir:
+            name = os.path.splitext(os.path.basename(path))[0] + ".txt"
+            with open(os.path.join(output_dir, name), "w", encoding="utf-8") as f:
+                f.write(text)
+    summary["seconds"] = round(time.perf_counter() - start, 2)
+    return summary
+
+
+if __name__ == "__main__":
+    summary = extract_corpus("resumes", output_dir="preprocessing_output_corpus")
+    print(f"✅ Extracted {summary['files']} PDFs ({summary['failed']} failed) in {summary['seconds']}s")
@@ -0,0 +1,241 @@
+from collections import namedtuple
+
+# -----------------------------
+# 🔹 Aho-Corasick keyword matcher
+# -----------------------------
+# All dictionary keywords are compiled into one automaton and found in a
+# single pass over the text, so matching stays linear in the text length no
+# matter how many keywords there are. Hits only count on token boundaries:
+# "git" does not match inside "digital" and "java" not inside "javascript".
+
+KeywordHit = namedtuple("KeywordHit", ["start", "end", "keyword", "label"])
+
+
+def _is_word_char(ch):
+    return ch.isalnum() or ch == "_"
+
+
+def normalize_keyword(keyword):
+    return " ".join(keyword.lower().split())
+
+
+def _lower_same_length(text):
+    """Lowercase text without changing its length, so offsets stay valid."""
+    lowered = text.lower()
+    if len(lowered) == len(text):
+        return lowered
+    return "".join(ch.lower() if len(ch.lower()) == 1 else ch for ch in text)
+
+
+class KeywordMatcher:
+    """Multi-pattern, case-insensitive, token-boundary keyword matcher."""
+
+    def __init__(self, keywords=None):
+        self._patterns = []       # pattern id -> normalized keyword
+        self._canonical = []      # pattern id -> keyword reported in hits
+        self._labels = []         # pattern id -> list of labels
+        self._pattern_ids = {}    # normalized keyword -> pattern id
+        self._compiled = False
+        if keywords:
+            self.add_many(keywords)
+
+    def __len__(self):
+        return len(self._patterns)
+
+    def add(self, keyword, label=None, canonical=None):
+        """Add a keyword; hits report `canonical` (e.g. for aliases) if given."""
+        keyword = normalize_keyword(keyword)
+        if not keyword:
+            return
+        pid = self._pattern_ids.get(keyword)
+        if pid is None:
+            pid = len(self._patterns)
+            self._pattern_ids[keyword] = pid
+            self._patterns.append(keyword)
+            self._canonical.append(canonical or keyword)
+            self._labels.append([])
+        if label not in self._labels[pid]:
+            self._labels[pid].append(label)
+        self._compiled = False
+
+    def add_many(self, keywords):
+        """Add keywords from a {label: iterable} dict or (keyword, label) pairs."""
+        if isinstance(keywords, dict):
+            for label, words in keywords.items():
+                for word in words:
+                    self.add(word, label)
+        else:
+            for keyword, label in keywords:
+                self.add(keyword, label)
+
+    def compile(self):
+        """Build the trie, failure links and output links."""
+        goto = [{}]
+        out = [[]]
+        for pid, pattern in enumerate(self._patterns):
+            state = 0
+            for ch in pattern:
+                nxt = goto[state].get(ch)
+                if nxt is None:
+                    nxt = len(goto)
+                    goto[state][ch] = nxt
+                    goto.append({})
+                    out.append([])
+                state = nxt
+            out[state].append(pid)
+
+        fail = [0] * len(goto)
+        dict_link = [0] * len(goto)
+        queue = list(goto[0].values())
+        head = 0
+        while head < len(queue):
+            state = queue[head]
+            head += 1
+            for ch, nxt in goto[state].items():
+                f = fail[state]
+                while f and ch not in goto[f]:
+                    f = fail[f]
+                f = goto[f].get(ch, 0)
+                fail[nxt] = f
+                # Nearest proper suffix state that ends a keyword
+                dict_link[nxt] = f if out[f] else dict_link[f]
+                queue.append(nxt)
+
+        self._goto = goto
+        self._fail = fail
+        self._out = out
+        self._dict_link = dict_link
+        self._lengths = [len(p) for p in self._patterns]
+        # Bit 1: keyword starts with a word char, bit 2: ends with one
+        self._boundary = [
+            (1 if _is_word_char(p[0]) else 0) | (2 if _is_word_char(p[-1]) else 0)
+            for p in self._patterns
+        ]
+        self._compiled = True
+        return self
+
+    def to_tables(self):
+        """
+        Flatten the compiled automaton into integer tables (for serialization):
+        per-state edge ranges into (edge_char, edge_target) sorted by code
+        point, failure/output links, and the pattern id ending at each state.
+        """
+        if not self._compiled:
+            self.compile()
+        edge_start, edge_char, edge_target = [0], [], []
+        for transitions in self._goto:
+            for ch in sorted(transitions):
+                edge_char.append(ord(ch))
+                edge_target.append(transitions[ch])
+            edge_start.append(len(edge_char))
+        return {
+            "edge_start": edge_start,
+            "edge_char": edge_char,
+            "edge_target": edge_target,
+            "fail": list(self._fail),
+            "dict_link": list(self._dict_link),
+            "state_pattern": [pids[0] if pids else -1 for pids in self._out],
+            "pattern_length": list(self._lengths),
+            "pattern_boundary": list(self._boundary),
+        }
+
+    def find(self, text):
+        """Return every KeywordHit in text, in order of end offset."""
+        if not self._compiled:
+            self.compile()
+
+        goto, fail, out, dict_link = self._goto, self._fail, self._out, self._dict_link
+        lowered = _lower_same_length(text)
+        n = len(lowered)
+        hits = []
+        state = 0
+        for i, ch in enumerate(lowered):
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+
+            s = state if out[state] else dict_link[state]
+            while s:
+                for pid in out[s]:
+                    start = i - self._lengths[pid] + 1
+                    end = i + 1
+                    # Token boundaries on the word-character edges of the keyword
+                    boundary = self._boundary[pid]
+                    if boundary & 1 and start > 0 and _is_word_char(lowered[start - 1]):
+                        continue
+                    if boundary & 2 and end < n and _is_word_char(lowered[end]):
+                        continue
+                    keyword = self._canonical[pid]
+                    for label in self._labels[pid]:
+                        hits.append(KeywordHit(start, end, keyword, label))
+                s = dict_link[s]
+        return hits
+
+    def find_by_label(self, text):
+        """Return {label: sorted unique keywords found} for text."""
+        found = {}
+        for hit in self.find(text):
+            found.setdefault(hit.label, set()).add(hit.keyword)
+        return {label: sorted(words) for label, words in found.items()}
+
+
+# -----------------------------
+# 🔹 Table-backed matcher
+# -----------------------------
+class _LazyTransitions:
+    """goto[state] over flattened edge tables; a state's dict is built on first visit."""
+
+    def __init__(self, edge_start, edge_char, edge_target):
+        self._edge_start = edge_start
+        self._edge_char = edge_char
+        self._edge_target = edge_target
+        self._cache = {}
+
+    def __getitem__(self, state):
+        transitions = self._cache.get(state)
+        if transitions is None:
+            lo, hi = self._edge_start[state], self._edge_start[state + 1]
+            transitions = {
+                chr(self._edge_char[k]): self._edge_target[k] for k in range(lo, hi)
+            }
+            self._cache[state] = transitions
+        return transitions
+
+
+class _StateOutputs:
+    """out[state] over the state_pattern table (at most one keyword ends per state)."""
+
+    def __init__(self, state_pattern):
+        self._state_pattern = state_pattern
+
+    def __getitem__(self, state):
+        pid = self._state_pattern[state]
+        return (pid,) if pid >= 0 else ()
+
+
+class MappedKeywordMatcher(KeywordMatcher):
+    """
+    KeywordMatcher over precompiled tables (see to_tables), e.g. memoryviews
+    into a memory-mapped index file. Nothing is rebuilt at load time.
+    `canonical` and `labels` are sequences indexed by pattern id.
+    """
+
+    def __init__(self, tables, canonical, labels):
+        super().__init__()
+        self._goto = _LazyTransitions(
+            tables["edge_start"], tables["edge_char"], tables["edge_target"]
+        )
+        self._fail = tables["fail"]
+        self._dict_link = tables["dict_link"]
+        self._out = _StateOutputs(tables["state_pattern"])
+        self._lengths = tables["pattern_length"]
+        self._boundary = tables["pattern_boundary"]
+        self._canonical = canonical
+        self._labels = labels
+        self._compiled = True
+
+    def __len__(self):
+        return len(self._lengths)
+
+    def add(self, keyword, label=None, canonical=None):
+        raise TypeError("MappedKeywordMatcher is read-only; rebuild the index instead")
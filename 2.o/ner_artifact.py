@@ -0,0 +1,161 @@
+import ast
+import json
+import os
+
+from atomic_file import atomic_write
+
+try:
+    import msgpack
+except ImportError:  # JSON fallback keeps artifacts readable without msgpack
+    msgpack = None
+
+# -----------------------------
+# 🔹 Structured NER artifact
+# -----------------------------
+# Versioned, schema-checked replacement for the "KEY: ['a', 'b']" text
+# files. An artifact is a plain dict:
+#
+#   schema_version    int, ARTIFACT_SCHEMA_VERSION
+#   model             spaCy model used
+#   taxonomy_version  skill dictionary version (see skill_taxonomy)
+#   text_sha256       hash of the analyzed text
+#   fields            {"NAME": [...], ..., "SKILLS": [...]}  (NER_FIELDS)
+#   entities          [{"text", "label", "start", "end"}]  offsets into the analyzed text
+#   keyword_hits      [{"keyword", "label", "start", "end"}]  offsets into the
+#                     lowercased token stream the keywords are matched on
+#
+# On disk it is MAGIC + one encoding byte (b"M" msgpack, b"J" JSON) + payload.
+
+ARTIFACT_SCHEMA_VERSION = 1
+ARTIFACT_MAGIC = b"NERA"
+ARTIFACT_FILENAME = "ner_structured_output.ner"
+LEGACY_FILENAME = "ner_structured_output.txt"
+NER_FIELDS = ["NAME", "ORG", "EDUCATION", "EXPERIENCE", "PROJECTS", "ACHIEVEMENTS", "SKILLS"]
+
+_SPAN_KEYS = {
+    "entities": ("text", "label", "start", "end"),
+    "keyword_hits": ("keyword", "label", "start", "end"),
+}
+
+
+def build_artifact(analysis, fields=None):
+    """Build an artifact from an analyze_document() result (fields default to its NER dict)."""
+    artifact = {
+        "schema_version": ARTIFACT_SCHEMA_VERSION,
+        "model": analysis.get("model"),
+        "taxonomy_version": analysis.get("taxonomy_version"),
+        "text_sha256": analysis.get("text_sha256"),
+        "fields": {k: list(v) for k, v in (fields or analysis["ner"]).items()},
+        "entities": [dict(e) for e in analysis.get("entities", [])],
+        "keyword_hits": [dict(h) for h in analysis.get("keyword_hits", [])],
+    }
+    validate_artifact(artifact)
+    return artifact
+
+
+def validate_artifact(artifact):
+    """Raise ValueError if artifact does not follow the schema."""
+    if not isinstance(artifact, dict):
+        raise ValueError("NER artifact must be a dict")
+    if artifact.get("schema_version") != ARTIFACT_SCHEMA_VERSION:
+        raise ValueError(f"Unsupported NER artifact schema: {artifact.get('schema_version')!r}")
+
+    fields = artifact.get("fields")
+    if not isinstance(fields, dict):
+        raise ValueError("NER artifact 'fields' must be a dict")
+    for field in NER_FIELDS:
+        values = fields.get(field)
+        if not isinstance(values, list) or not all(isinstance(v, str) for v in values):
+            raise ValueError(f"NER artifact field {field!r} must be a list of strings")
+
+    for section, keys in _SPAN_KEYS.items():
+        for span in artifact.get(section, []):
+            if not isinstance(span, dict) or any(k not in span for k in keys):
+                raise ValueError(f"NER artifact {section} entries need keys {keys}")
+            if not (isinstance(span["start"], int) and isinstance(span["end"], int)):
+                raise ValueError(f"NER artifact {section} offsets must be integers")
+    return artifact
+
+
+def is_artifact(data):
+    return isinstance(data, dict) and "schema_version" in data and "fields" in data
+
+
+def ner_fields(data):
+    """The NAME/ORG/.../SKILLS dict from either an artifact or a plain NER dict."""
+    return data["fields"] if is_artifact(data) else data
+
+
+# -----------------------------
+# 🔹 Encoding
+# -----------------------------
+def encode_artifact(artifact):
+    validate_artifact(artifact)
+    if msgpack is not None:
+        return ARTIFACT_MAGIC + b"M" + msgpack.packb(artifact, use_bin_type=True)
+    return ARTIFACT_MAGIC + b"J" + json.dumps(artifact, separators=(",", ":")).encode("utf-8")
+
+
+def decode_artifact(data):
+    if data[:4] != ARTIFACT_MAGIC:
+        raise ValueError("Not a NER artifact")
+    encoding, payload = data[4:5], data[5:]
+    if encoding == b"M":
+        if msgpack is None:
+            raise ValueError("msgpack is required to read this NER artifact")
+        artifact = msgpack.unpackb(payload, raw=False)
+    elif encoding == b"J":
+        artifact = json.loads(payload.decode("utf-8"))
+    else:
+        raise ValueError(f"Unknown NER artifact encoding {encoding!r}")
+    return validate_artifact(artifact)
+
+
+def save_artifact(artifact, output_dir, filename=ARTIFACT_FILENAME):
+    """Write artifact to <output_dir>/<filename>; returns the path."""
+    os.makedirs(output_dir, exist_ok=True)
+    output_file = os.path.join(output_dir, filename)
+    data = encode_artifact(artifact)
+    with atomic_write(output_file) as f:
+        f.write(data)
+    return output_file
+
+
+def load_artifact(path):
+    with open(path, "rb") as f:
+        return decode_artifact(f.read())
+
+
+# -----------------------------
+# 🔹 Loading NER Data
+# -----------------------------
+def _load_legacy_ner_text(file_path):
+    """Parse the old "KEY: ['a', 'b']" text format (values may contain commas)."""
+    ner_data = {}
+    with open(file_path, "r", encoding="utf-8") as f:
+        for line in f:
+            if ":" in line:
+                key, value = line.strip().split(":", 1)
+                try:
+                    values = ast.literal_eval(value.strip())
+                except (ValueError, SyntaxError):
+                    values = value.strip().strip("[]").replace("'", "").split(", ")
+                ner_data[key.strip()] = [str(v).strip() for v in values if str(v).strip()]
+    return ner_data
+
+
+def load_ner_data(file_path):
+    """Load NER fields from an artifact file or a legacy text file."""
+    with open(file_path, "rb") as f:
+        head = f.read(len(ARTIFACT_MAGIC))
+    if head == ARTIFACT_MAGIC:
+        return load_artifact(file_path)["fields"]
+    return _load_legacy_ner_text(file_path)
+
+
+def find_ner_output(output_dir):
+    """Path of the NER output in output_dir, preferring the artifact format."""
+    artifact_path = os.path.join(output_dir, ARTIFACT_FILENAME)
+    if os.path.exists(artifact_path):
+        return artifact_path
+    return os.path.join(output_dir, LEGACY_FILENAME)
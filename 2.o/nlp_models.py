@@ -0,0 +1,203 @@
+import os
+import threading
+import time
+
+# -----------------------------
+# 🔹 Model tiers & stage profiles
+# -----------------------------
+# A tier trades accuracy for speed. Callers pass a tier or a model name;
+# the default comes from $NLP_TIER, and individual stages can be pinned
+# with $NLP_STAGE_TIERS (e.g. "tokenize=fast,analysis=accurate").
+#
+# Each stage runs only the components it needs over the shared pipeline
+# (nlp(text, disable=...)), so e.g. tokenization never runs the
+# transformer and no stage loads a second copy of a model.
+
+MODEL_TIERS = {
+    "fast": "en_core_web_sm",
+    "balanced": "en_core_web_md",   # en_core_web_lg also works here
+    "accurate": "en_core_web_trf",
+}
+TIER_ENV = "NLP_TIER"
+STAGE_TIERS_ENV = "NLP_STAGE_TIERS"
+DEFAULT_TIER = os.environ.get(TIER_ENV, "accurate")
+
+ALL_COMPONENTS = "*"
+STAGE_DISABLE = {
+    "tokenize": ALL_COMPONENTS,                                   # tokenizer only
+    "parse": ("ner", "entity_ruler", "lemmatizer"),
+    "ner": ("tagger", "morphologizer", "parser", "senter", "attribute_ruler", "lemmatizer"),
+    "analysis": ("lemmatizer",),                                  # tokens + parse + entities
+}
+
+
+def stage_tiers():
+    """{stage: tier} overrides parsed from $NLP_STAGE_TIERS."""
+    overrides = {}
+    for item in os.environ.get(STAGE_TIERS_ENV, "").split(","):
+        stage, _, tier = item.partition("=")
+        if stage.strip() and tier.strip():
+            overrides[stage.strip()] = tier.strip()
+    return overrides
+
+
+def resolve_model(tier_or_model=None, stage=None):
+    """
+    spaCy model name for a tier ("fast"/"balanced"/"accurate") or a model
+    name (returned as-is). None means the stage's configured tier, falling
+    back to the default tier.
+    """
+    if tier_or_model is None:
+        tier_or_model = stage_tiers().get(stage, DEFAULT_TIER)
+    return MODEL_TIERS.get(tier_or_model, tier_or_model)
+
+
+DEFAULT_MODEL = resolve_model(DEFAULT_TIER)
+
+
+# -----------------------------
+# 🔹 Shared spaCy model registry
+# -----------------------------
+# Every stage (tokenization, parsing, NER, CV/main.py) gets its pipeline from
+# here, so a model is loaded once per process instead of once per module or
+# once per call.
+
+_registry = {}
+_stats = {}
+_key_locks = {}
+_registry_lock = threading.Lock()
+
+
+def _model_key(model_name, disable):
+    return (model_name, tuple(sorted(set(disable or ()))))
+
+
+def _current_rss_bytes():
+    """Resident set size of this process in bytes (None if unavailable)."""
+    try:
+        import psutil
+        return psutil.Process(os.getpid()).memory_info().rss
+    except ImportError:
+        pass
+    try:
+        with open("/proc/self/statm", "r") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError, AttributeError):
+        return None
+
+
+def get_nlp(model_name=DEFAULT_MODEL, disable=()):
+    """
+    Return the shared spaCy pipeline for (model name or tier, disabled components).
+    The model is loaded lazily on first use; concurrent callers asking for the
+    same key wait for a single load instead of loading their own copy.
+    """
+    model_name = resolve_model(model_name)
+    key = _model_key(model_name, disable)
+
+    nlp = _registry.get(key)
+    if nlp is not None:
+        _stats[key]["hits"] += 1
+        return nlp
+
+    with _registry_lock:
+        key_lock = _key_locks.setdefault(key, threading.Lock())
+
+    with key_lock:
+        nlp = _registry.get(key)
+        if nlp is not None:
+            _stats[key]["hits"] += 1
+            return nlp
+
+        import spacy
+
+        rss_before = _current_rss_bytes()
+        start = time.perf_counter()
+        nlp = spacy.load(model_name, disable=list(key[1]))
+        load_seconds = time.perf_counter() - start
+        rss_after = _current_rss_bytes()
+
+        rss_delta = None
+        if rss_before is not None and rss_after is not None:
+            rss_delta = rss_after - rss_before
+
+        _stats[key] = {
+            "model": model_name,
+            "disabled": list(key[1]),
+            "pipeline": list(nlp.pipe_names),
+            "load_seconds": round(load_seconds, 3),
+            "rss_delta_bytes": rss_delta,
+            "loaded_at": time.time(),
+            "hits": 0,
+        }
+        _registry[key] = nlp
+        print(f"✅ Loaded spaCy model '{model_name}' in {load_seconds:.2f}s")
+        return nlp
+
+
+def model_identity(model_name=DEFAULT_MODEL):
+    """
+    "name@version" of a model or tier, for cache keys: results cached with
+    one version of a model stop matching once it is upgraded in place. The
+    version is nlp.meta["version"] of the loaded pipeline; a model that is
+    not loaded yet is not loaded just for its key (its package or
+    meta.json version is used instead).
+    """
+    model_name = resolve_model(model_name)
+    version = None
+    for key, nlp in list(_registry.items()):
+        if key[0] == model_name:
+            version = nlp.meta.get("version")
+            break
+    if version is None:
+        import spacy
+        version = spacy.util.get_package_version(model_name)
+        if version is None and os.path.isdir(model_name):
+            version = spacy.util.get_model_meta(model_name).get("version")
+        if version is None:
+            version = get_nlp(model_name).meta.get("version")
+    return f"{model_name}@{version}"
+
+
+def model_stats():
+    """Load time, memory delta and hit count for every loaded model."""
+    stats = [dict(s) for s in _stats.values()]
+    return {
+        "models": stats,
+        "loaded": len(stats),
+        "total_load_seconds": round(sum(s["load_seconds"] for s in stats), 3),
+        "process_rss_bytes": _current_rss_bytes(),
+    }
+
+
+def clear_models():
+    """Drop every loaded pipeline (e.g. to free memory or force a reload)."""
+    with _registry_lock:
+        _registry.clear()
+        _stats.clear()
+        _key_locks.clear()
+
+
+# -----------------------------
+# 🔹 Stage Execution
+# -----------------------------
+def stage_disabled(nlp, stage):
+    """Pipeline components the stage does not need (present in nlp)."""
+    disable = STAGE_DISABLE.get(stage, ())
+    if disable == ALL_COMPONENTS:
+        return list(nlp.pipe_names)
+    return [name for name in nlp.pipe_names if name in disable]
+
+
+def run_stage(text, stage="analysis", model=None):
+    """Process text with only the components stage needs; returns the Doc."""
+    nlp = get_nlp(resolve_model(model, stage))
+    return nlp(text, disable=stage_disabled(nlp, stage))
+
+
+def pipe_stage(texts, stage="analysis", model=None, batch_size=32, n_process=1):
+    """Batched run_stage over an iterable of texts (yields Docs in order)."""
+    nlp = get_nlp(resolve_model(model, stage))
+    return nlp.pipe(
+        texts, batch_size=batch_size, n_process=n_process, disable=stage_disabled(nlp, stage)
+    )
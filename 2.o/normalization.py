@@ -1,11 +1,117 @@
-import re
 import os
+from multiprocessing import get_context
+
+from offset_map import collapse_whitespace
+
+# -----------------------------
+# 🔹 Single-pass normalizer
+# -----------------------------
+# The text is encoded to UTF-8 once and run through a precomputed 256-byte
+# translation table. Letters, digits, whitespace and . , - ( ) are kept;
+# every other ASCII byte becomes a space. Bytes >= 0x80 pass through
+# untouched. If there are any, a second translate + split collects them,
+# and each distinct non-ASCII character that is not a letter or digit
+# (bullets, dashes, quotes) is replaced with one bytes.replace.
+# Whitespace is then collapsed with split/join. No step scans the text
+# with a regex.
+#
+# "+" and "#" survive only inside protected tokens (c++, c#, f#, g++, with
+# an optional version such as c++17). The fix-up only runs when the text
+# contains either character, and finds them with bytes.find. ".net" and
+# "node.js" need no special case, because dots are always kept.
+#
+# Behavior compared to the previous two-regex version:
+#   - c++ / c# / f# / g++ are kept ("c++" used to become "c").
+#   - Non-ASCII letters and digits are kept ("José" used to become "Jos").
+#   - Everything else is unchanged: other symbols become spaces, runs of
+#     whitespace collapse to one space, and the ends are stripped.
+# benchmark_normalization.py measures the speed-up and prints the diff.
+
+KEPT_PUNCTUATION = ".,-()"
+PROTECTED_TOKENS = ("c++", "c#", "f#", "g++", ".net", "node.js")
+
+_BYTE_TABLE = bytes(
+    b if b >= 0x80 or chr(b).isalnum() or chr(b).isspace() or chr(b) in KEPT_PUNCTUATION + "+#"
+    else 0x20
+    for b in range(256)
+)
+# Every ASCII byte -> space, so .split() keeps only the non-ASCII bytes
+_NON_ASCII_RUNS = bytes(b if b >= 0x80 else 0x20 for b in range(256))
+_WORD_BYTES = frozenset(b for b in range(256) if b >= 0x80 or b == 0x5F or chr(b).isalnum())
+_DIGITS = frozenset(b"0123456789")
+# symbol byte -> (the exact run that may survive, letters allowed before it)
+_PROTECTED_SYMBOLS = {ord("+"): (b"++", b"cCgG"), ord("#"): (b"#", b"cCfF")}
+
+
+def _clean_non_ascii(data):
+    """Replace every non-ASCII character that is not a letter/digit with a space."""
+    # Only the distinct characters are classified. UTF-8 is self-synchronizing,
+    # so replacing one character's bytes never touches another character.
+    chars = b"".join(data.translate(_NON_ASCII_RUNS).split()).decode("utf-8", "surrogatepass")
+    for char in set(chars):
+        if not char.isalnum():
+            data = data.replace(char.encode("utf-8", "surrogatepass"), b" ")
+    return data
+
+
+def _fix_symbols(data):
+    """Keep "++"/"#" of a protected token (c++, c#, f#, g++, c++17); blank the rest."""
+    out = bytearray(data)
+    size = len(data)
+    for symbol, (token, prefixes) in _PROTECTED_SYMBOLS.items():
+        start = data.find(symbol)
+        while start != -1:
+            end = start + 1
+            while end < size and data[end] == symbol:
+                end += 1
+            protected = (
+                data[start:end] == token
+                and start >= 1 and data[start - 1] in prefixes
+                and (start < 2 or data[start - 2] not in _WORD_BYTES)
+                and (end == size or data[end] not in _WORD_BYTES or data[end] in _DIGITS)
+            )
+            if not protected:
+                out[start:end] = b" " * (end - start)
+            start = data.find(symbol, end)
+    return bytes(out)
+
+
+def _clean_characters(text):
+    """normalize_text before whitespace is collapsed: exactly one char out per char in."""
+    data = text.encode("utf-8", "surrogatepass").translate(_BYTE_TABLE)
+    if b"+" in data or b"#" in data:
+        data = _fix_symbols(data)
+    if not data.isascii():
+        data = _clean_non_ascii(data)
+    return data.decode("utf-8")
+
 
 def normalize_text(text):
     """Clean text by removing special characters and extra spaces."""
-    text = re.sub(r'[^a-zA-Z0-9\s\.\,\-\(\)]', ' ', text)
-    text = re.sub(r'\s+', ' ', text)
-    return text.strip()
+    return " ".join(_clean_characters(text).split())
+
+
+def normalize_with_offsets(text):
+    """
+    normalize_text(text) plus an OffsetMap from the normalized text back to
+    text. Characters are cleaned one for one, so only the whitespace
+    collapse moves anything.
+    """
+    return collapse_whitespace(_clean_characters(text))
+
+
+def normalize_corpus(texts, n_process=1, chunksize=64):
+    """
+    normalize_text over many documents, yielded in input order. With
+    n_process > 1 the work is spread over worker processes.
+    """
+    if n_process <= 1:
+        for text in texts:
+            yield normalize_text(text)
+        return
+    with get_context().Pool(n_process) as pool:
+        yield from pool.imap(normalize_text, texts, chunksize=chunksize)
+
 
 if __name__ == "__main__":
     input_file = os.path.join("preprocessing_output_CV", "extracted_text.txt")
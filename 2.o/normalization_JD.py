@@ -1,11 +1,8 @@
-import re
 import os
 
-def normalize_text(text):
-    """Clean text by removing special characters and extra spaces."""
-    text = re.sub(r'[^a-zA-Z0-9\s\.\,\-\(\)]', ' ', text)
-    text = re.sub(r'\s+', ' ', text)
-    return text.strip()
+# Same single-pass normalizer as the CV side
+from normalization import PROTECTED_TOKENS, normalize_corpus, normalize_text, normalize_with_offsets
+
 
 if __name__ == "__main__":
     input_file = os.path.join("preprocessing_output_JD", "extracted_text.txt")
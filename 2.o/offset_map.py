@@ -0,0 +1,119 @@
+import re
+from array import array
+from bisect import bisect_right
+
+# -----------------------------
+# 🔹 Character offset maps
+# -----------------------------
+# Every stage derives a new text from the previous one (normalized text,
+# the joined token stream keyword matching runs on, ...). An OffsetMap
+# links positions in a derived text back to the text it came from, so a
+# token, entity or keyword hit can be located in the extracted resume
+# without running any NLP again.
+#
+# A map is stored as segments in two unsigned int arrays: output positions
+# from out_starts[i] up to the next segment start were copied from the
+# source starting at src_starts[i]. A map therefore costs 8 bytes per token, not
+# per character. Positions between segments (the single spaces that
+# replaced collapsed whitespace) map to the end of the previous segment.
+#
+# Spans are kept as flat arrays too: [start0, end0, start1, end1, ...].
+#
+#   normalized, offsets = collapse_whitespace("  Python,\n\n SQL ")
+#   offsets.span_to_source(8, 11)       # -> (12, 15), "SQL" in the original
+
+_NON_SPACE_RE = re.compile(r"\S+")
+
+
+class OffsetMap:
+    """Positions in a derived text -> positions in its source text (segment-based)."""
+
+    __slots__ = ("out_starts", "src_starts", "length")
+
+    def __init__(self, out_starts, src_starts, length):
+        self.out_starts = array("I", out_starts)
+        self.src_starts = array("I", src_starts)
+        self.length = length
+        if len(self.out_starts) != len(self.src_starts):
+            raise ValueError("out_starts and src_starts must have the same length")
+
+    @classmethod
+    def identity(cls, length):
+        return cls([0], [0], length)
+
+    def __len__(self):
+        return self.length
+
+    def __eq__(self, other):
+        return (
+            isinstance(other, OffsetMap)
+            and self.length == other.length
+            and self.out_starts == other.out_starts
+            and self.src_starts == other.src_starts
+        )
+
+    def __getstate__(self):
+        return self.out_starts, self.src_starts, self.length
+
+    def __setstate__(self, state):
+        self.out_starts, self.src_starts, self.length = state
+
+    def __repr__(self):
+        return f"OffsetMap(length={self.length}, segments={len(self.out_starts)})"
+
+    def to_source(self, pos):
+        """Source position of derived position pos (0 <= pos <= length)."""
+        if not 0 <= pos <= self.length:
+            raise IndexError(f"position {pos} outside 0..{self.length}")
+        i = bisect_right(self.out_starts, pos) - 1
+        if i < 0:
+            return 0
+        return self.src_starts[i] + pos - self.out_starts[i]
+
+    def span_to_source(self, start, end):
+        """Source (start, end) covering derived text[start:end]."""
+        if end <= start:
+            pos = self.to_source(start)
+            return pos, pos
+        return self.to_source(start), self.to_source(end - 1) + 1
+
+    def spans_to_source(self, spans):
+        """Flat [start, end, ...] span array -> the same spans in source positions."""
+        mapped = array("I")
+        for start, end in zip(spans[::2], spans[1::2]):
+            mapped.extend(self.span_to_source(start, end))
+        return mapped
+
+
+def collapse_whitespace(text):
+    """Same as " ".join(text.split()), plus the OffsetMap back into text."""
+    pieces, out_starts, src_starts = [], array("I"), array("I")
+    pos = 0
+    for match in _NON_SPACE_RE.finditer(text):
+        if pieces:
+            pos += 1
+        out_starts.append(pos)
+        src_starts.append(match.start())
+        pieces.append(match.group())
+        pos += len(pieces[-1])
+    return " ".join(pieces), OffsetMap(out_starts, src_starts, pos)
+
+
+def join_tokens(tokens, spans, transform=None):
+    """
+    " ".join(tokens) (each token passed through transform, e.g. str.lower)
+    plus the OffsetMap from the joined text to the text the flat token
+    spans point into.
+    """
+    pieces = [transform(token) for token in tokens] if transform else list(tokens)
+    out_starts = array("I")
+    pos = 0
+    for piece in pieces:
+        out_starts.append(pos)
+        pos += len(piece) + 1
+    return " ".join(pieces), OffsetMap(out_starts, spans[::2], max(pos - 1, 0))
+
+
+def iter_spans(spans):
+    """(start, end) pairs of a flat span array."""
+    return zip(spans[::2], spans[1::2])
@@ -1,10 +1,17 @@
-import spacy
 import os
+from analysis import analyze_document, parse_rows
+from nlp_models import resolve_model, run_stage
+
+def parse_text(text, tier=None):
+    """Return (token, POS, dep, head) rows for text from the shared analysis."""
+    model = resolve_model(tier, "parse")
+    if model == resolve_model(None, "analysis"):
+        return list(analyze_document(text, model)["parse"])
+    # Other tiers run just the tagger/parser components
+    return parse_rows(run_stage(text, "parse", model))
 
-def parse_tokens(input_path, output_dir):
-    # Load English model
-    nlp = spacy.load("en_core_web_trf")
 
+def parse_tokens(input_path, output_dir):
     # Read tokens
     with open(input_path, "r", encoding="utf-8") as f:
         text = f.read()
@@ -14,8 +21,8 @@ def parse_tokens(input_path, output_dir):
     if "\n" in text:
         text = " ".join(text.splitlines())
 
-    # Process text through spaCy
-    doc = nlp(text)
+    # Process text through spaCy (single shared pass)
+    rows = parse_text(text)
 
     # Create output directory
     os.makedirs(output_dir, exist_ok=True)
@@ -23,8 +30,8 @@ def parse_tokens(input_path, output_dir):
 #   output_path = os.path.join(output_dir, "parsed_output.txt")
 
     with open(output_path, "w", encoding="utf-8") as f:
-        for token in doc:
-            f.write(f"{token.text}\t{token.pos_}\t{token.dep_}\t{token.head.text}\n")
+        for token, pos, dep, head in rows:
+            f.write(f"{token}\t{pos}\t{dep}\t{head}\n")
 
     print(f"✅ Parsing complete. Output saved at {output_path}")
 
@@ -0,0 +1,131 @@
+import importlib.util
+import io
+from itertools import chain
+
+# -----------------------------
+# 🔹 Unified PDF extraction layer
+# -----------------------------
+# One entry point for every caller (batch pipeline, UI uploads, corpus
+# extractor). A PDF source is either a path or the raw bytes of the file;
+# bytes are handed to the backend directly (PyMuPDF reads the buffer in
+# place), so uploads never touch a temp file.
+#
+# Backends are tried in order and the first one that succeeds wins:
+# PyMuPDF is much faster, pdfplumber is the fallback when PyMuPDF is not
+# installed or cannot read a file (see benchmark_pdf_backends.py).
+# Each backend yields page texts that end with a newline, so output joins
+# the same way whichever backend produced it.
+#
+# stream_pdf_pages is the streaming entry point: a backend is chosen as
+# soon as it has produced the first page, and every page is handed to the
+# caller as soon as it is decoded.
+
+DEFAULT_BACKENDS = ("pymupdf", "pdfplumber")
+# Budget for untrusted documents (UI uploads, batch CLI): nothing past
+# these limits is decoded
+MAX_UPLOAD_PAGES = 30
+MAX_UPLOAD_CHARS = 200_000
+_BACKEND_MODULES = {"pymupdf": "fitz", "pdfplumber": "pdfplumber"}
+
+
+def _is_bytes(source):
+    return isinstance(source, (bytes, bytearray, memoryview))
+
+
+def _pymupdf_pages(source):
+    import fitz  # PyMuPDF
+
+    if _is_bytes(source):
+        doc = fitz.open(stream=source, filetype="pdf")
+    else:
+        doc = fitz.open(source)
+    with doc:
+        for page in doc:
+            yield page.get_text()
+
+
+def _pdfplumber_pages(source):
+    import pdfplumber
+
+    with pdfplumber.open(io.BytesIO(source) if _is_bytes(source) else source) as pdf:
+        for page in pdf.pages:
+            text = page.extract_text() or ""   # None for pages without a text layer
+            page.close()
+            yield text + "\n" if text else ""
+
+
+_BACKENDS = {"pymupdf": _pymupdf_pages, "pdfplumber": _pdfplumber_pages}
+
+
+def available_backends():
+    """Installed backends, in preference order."""
+    return [
+        name for name in DEFAULT_BACKENDS
+        if importlib.util.find_spec(_BACKEND_MODULES[name]) is not None
+    ]
+
+
+def iter_pdf_pages(source, backend="pymupdf", max_pages=None, max_chars=None):
+    """
+    Yield page texts of a PDF (path or bytes) from one backend, lazily.
+    Stops after max_pages pages or once max_chars characters have been
+    yielded (the last page is cut short).
+    """
+    if backend not in _BACKENDS:
+        raise ValueError(f"Unknown PDF backend {backend!r}; choose from {list(_BACKENDS)}")
+    chars = 0
+    pages = _BACKENDS[backend](source)
+    try:
+        for page_number, text in enumerate(pages):
+            if max_pages is not None and page_number >= max_pages:
+                break
+            if max_chars is not None and chars + len(text) >= max_chars:
+                if max_chars > chars:
+                    yield text[:max_chars - chars]
+                break
+            chars += len(text)
+            yield text
+    finally:
+        pages.close()   # close the document even when the caller stops early
+
+
+def stream_pdf_pages(source, backends=None, max_pages=None, max_chars=None, stats=None):
+    """
+    Yield page texts of a PDF (path or bytes) as they are decoded. The next
+    backend is tried only if one fails before producing its first page;
+    errors after that propagate. If stats is a dict it gets the backend
+    used, the page count so far and any backend errors.
+    """
+    errors = {}
+    for backend in backends or available_backends():
+        pages = iter_pdf_pages(source, backend, max_pages, max_chars)
+        try:
+            first = next(pages, None)
+        except ImportError as e:
+            errors[backend] = f"not installed ({e})"
+            continue
+        except Exception as e:
+            errors[backend] = f"{type(e).__name__}: {e}"
+            continue
+        if stats is not None:
+            stats.update({"backend": backend, "pages": 0, "errors": errors})
+        if first is None:
+            return
+        try:
+            for text in chain((first,), pages):
+                if stats is not None:
+                    stats["pages"] += 1
+                yield text
+        finally:
+            pages.close()
+        return
+    raise ValueError(f"No PDF backend could read the document: {errors or 'none installed'}")
+
+
+def extract_pdf_text(source, backends=None, max_pages=None, max_chars=None, stats=None):
+    """
+    Full text of a PDF (path or bytes), using the first backend that works.
+    If stats is a dict it gets the backend used, page count and any
+    backend errors that triggered a fallback.
+    """
+    return "".join(stream_pdf_pages(source, backends, max_pages, max_chars, stats))
@@ -0,0 +1,317 @@
+import argparse
+import glob
+import json
+import os
+import sys
+import time
+from functools import partial
+from itertools import islice
+
+from corpus_extractor import DEFAULT_TIMEOUT, iter_corpus_texts
+from pdf_extraction import MAX_UPLOAD_CHARS, MAX_UPLOAD_PAGES
+
+# -----------------------------
+# 🔹 Headless batch pipeline
+# -----------------------------
+# Runs extraction, normalization, the single-pass spaCy analysis and
+# Resume-JD matching for a whole folder of resumes in one process, so the
+# model is loaded once and nothing goes through preprocessing_output_*
+# files. Writes one JSON line per resume with its scores against every JD
+# and per-stage timings:
+#
+#   python pipeline_cli.py resumes/ --jd jd.pdf --jd jd2.txt -o results.jsonl
+#   python pipeline_cli.py "resumes/**/*.pdf" --jd jd.txt --tier fast
+#
+# Extraction is fanned out over worker processes (corpus_extractor);
+# analysis runs in nlp.pipe batches. Batch stages report their time
+# amortized per document. Progress and the summary go to stderr.
+#
+# With --index, every analyzed resume is also added to a BM25 index
+# snapshot (Similarity/bm25_index.py) over its normalized text and NER
+# fields. Without resume sources, the snapshot is only searched: each JD
+# gets one JSON line with its top-k candidate resumes, no resume is
+# re-analyzed:
+#
+#   python pipeline_cli.py resumes/ --jd jd.pdf --index resumes.bm25
+#   python pipeline_cli.py --jd jd.pdf --index resumes.bm25 --top-k 20 -o candidates.jsonl
+#
+# Snapshots are pickles: only load ones this pipeline wrote.
+
+DOCUMENT_EXTENSIONS = (".pdf", ".txt")
+CHUNK_SIZE = 64
+TOP_K = 10
+
+
+def log(*args):
+    print(*args, file=sys.stderr)
+
+
+def extract_document(path, max_pages=MAX_UPLOAD_PAGES, max_chars=MAX_UPLOAD_CHARS):
+    """
+    PDF or plain-text file -> (text, stats), reading at most max_pages
+    pages / max_chars characters; top-level so workers can pickle it.
+    """
+    if path.lower().endswith(".pdf"):
+        from pdf_extraction import extract_pdf_text
+
+        stats = {}
+        text = extract_pdf_text(path, max_pages=max_pages, max_chars=max_chars, stats=stats)
+        return text, {"pages": stats["pages"], "backend": stats["backend"]}
+    with open(path, "r", encoding="utf-8", errors="replace") as f:
+        return f.read(max_chars if max_chars is not None else -1), {"pages": None, "backend": "text"}
+
+
+def iter_document_paths(sources):
+    """Resume/JD files from folders (PDF and TXT), glob patterns or file paths."""
+    for source in sources:
+        if os.path.isdir(source):
+            with os.scandir(source) as entries:
+                for entry in sorted(entries, key=lambda e: e.name):
+                    if entry.is_file() and entry.name.lower().endswith(DOCUMENT_EXTENSIONS):
+                        yield entry.path
+        elif os.path.isfile(source):
+            yield source
+        else:
+            for path in sorted(glob.iglob(source, recursive=True)):
+                if path.lower().endswith(DOCUMENT_EXTENSIONS):
+                    yield path
+
+
+def _ms(seconds):
+    return round(seconds * 1000, 2)
+
+
+# -----------------------------
+# 🔹 Stages
+# -----------------------------
+
+def analyze_jds(jd_paths, model_name, batch_size, max_pages=MAX_UPLOAD_PAGES, max_chars=MAX_UPLOAD_CHARS):
+    """Extract, normalize and analyze the JDs; yields (path, normalized text, analysis)."""
+    from analysis import iter_analyze_documents
+    from normalization import normalize_text
+
+    texts = [normalize_text(extract_document(path, max_pages, max_chars)[0]) for path in jd_paths]
+    analyses = iter_analyze_documents(texts, model_name, batch_size=batch_size)
+    return zip(jd_paths, texts, analyses)
+
+
+def prepare_jds(jd_paths, model_name, batch_size, max_pages=MAX_UPLOAD_PAGES, max_chars=MAX_UPLOAD_CHARS):
+    """Extract, normalize and analyze the JDs; returns [(path, skills, BatchMatcher)]."""
+    from Similarity.batch_matching import BatchMatcher
+
+    jds = []
+    for path, _, analysis in analyze_jds(jd_paths, model_name, batch_size, max_pages, max_chars):
+        skills = {s.lower() for s in analysis["ner"].get("SKILLS", [])}
+        jds.append((path, skills, BatchMatcher(analysis["ner"])))
+    return jds
+
+
+def process_chunk(chunk, jds, model_name, batch_size, n_process, totals, index=None):
+    """
+    Normalize, analyze and score one chunk of extracted resumes; returns
+    records. With a BM25Index, the analyzed resumes are also added to it.
+    """
+    from analysis import iter_analyze_documents
+    from normalization import normalize_text
+    from Similarity.Resume_JD_Matching import get_match_category
+
+    records, texts = [], []
+    for path, text, stats in chunk:
+        record = {
+            "resume": path,
+            "chars": stats["chars"],
+            "pages": stats.get("pages"),
+            "error": stats["error"],
+            "timings_ms": {"extract": _ms(stats["seconds"])},
+        }
+        records.append(record)
+        if record["error"]:
+            continue
+        start = time.perf_counter()
+        texts.append(normalize_text(text))
+        record["timings_ms"]["normalize"] = _ms(time.perf_counter() - start)
+        totals["normalize"] += time.perf_counter() - start
+    ok = [r for r in records if not r["error"]]
+    if not ok:
+        return records
+
+    start = time.perf_counter()
+    analyses = list(iter_analyze_documents(texts, model_name, batch_size=batch_size, n_process=n_process))
+    seconds = time.perf_counter() - start
+    totals["analysis"] += seconds
+    for record, analysis in zip(ok, analyses):
+        record["timings_ms"]["analysis"] = _ms(seconds / len(ok))
+        record["entities"] = {field: len(values) for field, values in analysis["ner"].items()}
+        record["matches"] = []
+
+    if index is not None:
+        start = time.perf_counter()
+        for record, text, analysis in zip(ok, texts, analyses):
+            index.add(record["resume"], text, analysis["ner"])
+        seconds = time.perf_counter() - start
+        totals["index"] = totals.get("index", 0.0) + seconds
+        for record in ok:
+            record["timings_ms"]["index"] = _ms(seconds / len(ok))
+
+    start = time.perf_counter()
+    ners = [analysis["ner"] for analysis in analyses]
+    for jd_path, jd_skills, matcher in jds:
+        for record, ner, (scores, overall) in zip(ok, ners, matcher.score(ners)):
+            resume_skills = {s.lower() for s in ner.get("SKILLS", [])}
+            record["matches"].append({
+                "jd": jd_path,
+                "scores": scores,
+                "overall": overall,
+                "category": get_match_category(overall),
+                "missing_skills": sorted(jd_skills - resume_skills),
+            })
+    seconds = time.perf_counter() - start
+    totals["match"] += seconds
+    for record in ok:
+        record["timings_ms"]["match"] = _ms(seconds / len(ok))
+    return records
+
+
+def run_pipeline(resume_sources, jd_paths, output, tier=None, workers=None, timeout=DEFAULT_TIMEOUT,
+                 batch_size=32, n_process=1, chunk_size=CHUNK_SIZE,
+                 max_pages=MAX_UPLOAD_PAGES, max_chars=MAX_UPLOAD_CHARS, index_path=None):
+    """
+    Run every stage for all resumes against all JDs and write JSONL records
+    to output (a path, or "-" for stdout). Each document is read up to
+    max_pages pages / max_chars characters. With index_path, the resumes are
+    also added to that BM25 snapshot (created if missing). Returns a run
+    summary.
+    """
+    from nlp_models import get_nlp, resolve_model
+
+    model_name = resolve_model(tier, "analysis")
+    run_start = time.perf_counter()
+    get_nlp(model_name)
+    summary = {"model": model_name, "resumes": 0, "failed": 0, "jds": len(jd_paths),
+               "load_seconds": round(time.perf_counter() - run_start, 3)}
+    totals = {"extract": 0.0, "normalize": 0.0, "analysis": 0.0, "match": 0.0}
+
+    start = time.perf_counter()
+    jds = prepare_jds(jd_paths, model_name, batch_size, max_pages, max_chars)
+    summary["jd_seconds"] = round(time.perf_counter() - start, 3)
+
+    index = None
+    if index_path:
+        from Similarity.bm25_index import open_index
+        index = open_index(index_path)
+
+    out = sys.stdout if output == "-" else open(output, "w", encoding="utf-8")
+    try:
+        extracted = iter_corpus_texts(
+            iter_document_paths(resume_sources), workers=workers, timeout=timeout,
+            extract_fn=partial(extract_document, max_pages=max_pages, max_chars=max_chars),
+        )
+        while True:
+            start = time.perf_counter()
+            chunk = list(islice(extracted, chunk_size))
+            totals["extract"] += time.perf_counter() - start
+            if not chunk:
+                break
+            for record in process_chunk(chunk, jds, model_name, batch_size, n_process, totals, index):
+                summary["resumes"] += 1
+                if record["error"]:
+                    summary["failed"] += 1
+                    log(f"⚠️ {record['resume']}: {record['error']}")
+                out.write(json.dumps(record, ensure_ascii=False) + "\n")
+            out.flush()
+            log(f"📄 {summary['resumes']} resumes processed")
+    finally:
+        if out is not sys.stdout:
+            out.close()
+    if index is not None:
+        index.save(index_path)
+        summary["indexed"] = len(index)
+
+    seconds = time.perf_counter() - run_start
+    summary["stage_seconds"] = {stage: round(value, 3) for stage, value in totals.items()}
+    summary["seconds"] = round(seconds, 3)
+    summary["resumes_per_sec"] = round(summary["resumes"] / seconds, 2) if seconds else 0.0
+    return summary
+
+
+def search_index(index_path, jd_paths, output, tier=None, top_k=TOP_K, batch_size=32,
+                 max_pages=MAX_UPLOAD_PAGES, max_chars=MAX_UPLOAD_CHARS):
+    """
+    Retrieve the top_k resumes for each JD from the BM25 snapshot at
+    index_path (only load snapshots this pipeline wrote: they are pickles).
+    Writes one JSON line per JD to output; returns a run summary.
+    """
+    from nlp_models import resolve_model
+    from Similarity.bm25_index import BM25Index, document_terms
+
+    model_name = resolve_model(tier, "analysis")
+    run_start = time.perf_counter()
+    index = BM25Index.load(index_path)
+    summary = {"model": model_name, "indexed": len(index), "jds": len(jd_paths)}
+
+    out = sys.stdout if output == "-" else open(output, "w", encoding="utf-8")
+    try:
+        for path, text, analysis in analyze_jds(jd_paths, model_name, batch_size, max_pages, max_chars):
+            start = time.perf_counter()
+            hits = index.search(document_terms(text, analysis["ner"]), k=top_k)
+            record = {
+                "jd": path,
+                "candidates": [{"resume": key, "score": round(score, 4)} for key, score in hits],
+                "timings_ms": {"search": _ms(time.perf_counter() - start)},
+            }
+            out.write(json.dumps(record, ensure_ascii=False) + "\n")
+    finally:
+        if out is not sys.stdout:
+            out.close()
+
+    summary["seconds"] = round(time.perf_counter() - run_start, 3)
+    return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Score resumes against job descriptions in one process")
+    parser.add_argument("resumes", nargs="*",
+                        help="resume folders, glob patterns or files (PDF/TXT); omit to only search --index")
+    parser.add_argument("--jd", action="append", required=True, help="job description file (repeatable)")
+    parser.add_argument("-o", "--output", default="pipeline_results.jsonl", help='JSONL output ("-" for stdout)')
+    parser.add_argument("--tier", help="model tier or spaCy model name (see nlp_models.MODEL_TIERS)")
+    parser.add_argument("--workers", type=int, help="extraction processes (default: CPU count)")
+    parser.add_argument("--timeout", type=float, default=DEFAULT_TIMEOUT, help="seconds per file")
+    parser.add_argument("--batch-size", type=int, default=32)
+    parser.add_argument("--n-process", type=int, default=1, help="spaCy nlp.pipe processes")
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE, help="resumes per analysis chunk")
+    parser.add_argument("--max-pages", type=int, default=MAX_UPLOAD_PAGES, help="pages read per document")
+    parser.add_argument("--max-chars", type=int, default=MAX_UPLOAD_CHARS, help="characters read per document")
+    parser.add_argument("--index", help="BM25 index snapshot: resumes are added to it, or, without resumes, "
+                                        "searched for each JD (a pickle: only use trusted files)")
+    parser.add_argument("--top-k", type=int, default=TOP_K, help="candidates per JD when searching --index")
+    args = parser.parse_args()
+
+    missing = [path for path in args.jd if not os.path.isfile(path)]
+    if missing:
+        parser.error(f"JD file not found: {', '.join(missing)}")
+
+    if not args.resumes:
+        if not args.index or not os.path.isfile(args.index):
+            parser.error("give resume sources, or an existing --index snapshot to search")
+        summary = search_index(
+            args.index, args.jd, args.output, tier=args.tier, top_k=args.top_k,
+            batch_size=args.batch_size, max_pages=args.max_pages, max_chars=args.max_chars,
+        )
+        log(f"✅ Searched {summary['indexed']} indexed resumes for {summary['jds']} JDs in {summary['seconds']}s")
+        log(json.dumps(summary))
+        return
+
+    summary = run_pipeline(
+        args.resumes, args.jd, args.output, tier=args.tier, workers=args.workers,
+        timeout=args.timeout, batch_size=args.batch_size, n_process=args.n_process,
+        chunk_size=args.chunk_size, max_pages=args.max_pages, max_chars=args.max_chars,
+        index_path=args.index,
+    )
+    log(f"✅ {summary['resumes']} resumes ({summary['failed']} failed) x {summary['jds']} JDs "
+        f"in {summary['seconds']}s ({summary['resumes_per_sec']} resumes/sec)")
+    log(json.dumps(summary))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,204 @@
+import hashlib
+import json
+import pickle
+import threading
+from collections import OrderedDict, namedtuple
+
+from result_cache import content_key, get_result_cache
+
+# -----------------------------
+# 🔹 Lazy pipeline graph
+# -----------------------------
+# Stages declare the values they read and the values they produce; a run
+# asks for outputs and only the stages those outputs depend on execute.
+#
+# Every stage result is memoized under a fingerprint of what went into it:
+# the stage name and version, the fingerprints of its inputs and the
+# current value of its external dependencies (model version, taxonomy
+# version, ...). Every value is fingerprinted by its content, whichever
+# way it was reached: normalized text made by the normalize stage and the
+# same text passed in directly share their spaCy pass. A stage's output
+# fingerprints are computed once, when it runs, and memoized with its
+# outputs, so a memo hit never hashes anything again. A change only re-runs
+# the stages downstream of it: a new skill taxonomy re-runs keyword
+# matching but reuses the spaCy outputs.
+#
+#   graph = PipelineGraph("demo")
+#
+#   @graph.stage(inputs=("text",), outputs=("tokens",))
+#   def tokenize(text):
+#       return {"tokens": text.split()}
+#
+#   graph.run(["tokens"], text="a b c")   # -> {"tokens": ["a", "b", "c"]}
+
+MEMO_SIZE = 256
+MEMO_FORMAT = "2"   # memo entries are (outputs, output fingerprints)
+
+Stage = namedtuple("Stage", "name inputs outputs fn version depends persist")
+
+
+class PipelineGraph:
+    """Declarative stage graph with demand-driven execution and per-stage memoization."""
+
+    def __init__(self, name, memo_size=MEMO_SIZE, fingerprinters=None):
+        """
+        fingerprinters map an input name to a function of its value whose
+        result is fingerprinted instead of the value itself (e.g. a model
+        name -> "name@version", so an upgraded model re-runs its stages).
+        """
+        self.name = name
+        self.memo_size = memo_size
+        self.fingerprinters = dict(fingerprinters or {})
+        self.stages = OrderedDict()
+        self._producers = {}
+        self._memo = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = {"runs": {}, "memo_hits": 0, "disk_hits": 0}
+
+    # ---------- declaration ----------
+
+    def add_stage(self, name, fn, inputs, outputs, version="1", depends=(), persist=False):
+        """
+        Register fn(**inputs) -> {output: value}. depends are zero-argument
+        callables whose results also key the memo (e.g. taxonomy_version);
+        persist=True also keeps results in the on-disk result cache.
+        """
+        if name in self.stages:
+            raise ValueError(f"Stage {name!r} is already defined")
+        for output in outputs:
+            if output in self._producers:
+                raise ValueError(f"{output!r} is already produced by stage {self._producers[output]!r}")
+        self.stages[name] = Stage(name, tuple(inputs), tuple(outputs), fn, str(version), tuple(depends), persist)
+        for output in outputs:
+            self._producers[output] = name
+        return fn
+
+    def stage(self, inputs, outputs, name=None, **kwargs):
+        """Decorator form of add_stage."""
+        def register(fn):
+            return self.add_stage(name or fn.__name__, fn, inputs, outputs, **kwargs)
+        return register
+
+    # ---------- planning ----------
+
+    def plan(self, outputs, provided=()):
+        """Stage names needed for outputs, in execution order, given the provided inputs."""
+        order, visiting = [], set()
+
+        def visit(value):
+            if value in provided:
+                return
+            stage_name = self._producers.get(value)
+            if stage_name is None:
+                raise KeyError(f"No stage produces {value!r} and it was not provided")
+            if stage_name in order:
+                return
+            if stage_name in visiting:
+                raise ValueError(f"Cycle in pipeline graph at stage {stage_name!r}")
+            visiting.add(stage_name)
+            for name in self.stages[stage_name].inputs:
+                visit(name)
+            visiting.discard(stage_name)
+            order.append(stage_name)
+
+        for output in outputs:
+            visit(output)
+        return order
+
+    # ---------- execution ----------
+
+    def fingerprint(self, stage, input_fingerprints):
+        depends = [str(dep()) for dep in stage.depends]
+        return content_key(
+            f"stage.{self.name}.{stage.name}", MEMO_FORMAT, stage.version,
+            *[input_fingerprints[name] for name in stage.inputs], *depends,
+        )
+
+    def lookup(self, stage_name, fingerprint):
+        """Memoized outputs for a stage fingerprint (memory, then disk), else None."""
+        entry = self._lookup_entry(stage_name, fingerprint)
+        return entry[0] if entry is not None else None
+
+    def _lookup_entry(self, stage_name, fingerprint):
+        with self._lock:
+            hit = self._memo.get(fingerprint)
+            if hit is not None:
+                self._memo.move_to_end(fingerprint)
+                self.stats["memo_hits"] += 1
+                return hit
+        if self.stages[stage_name].persist:
+            cache = get_result_cache()
+            hit = cache.get(fingerprint) if cache is not None else None
+            if hit is not None:
+                self.stats["disk_hits"] += 1
+                self._remember(fingerprint, hit)
+                return hit
+        return None
+
+    def store(self, stage_name, fingerprint, results):
+        """Memoize a stage's outputs (e.g. ones computed in a batch outside run())."""
+        entry = (results, {output: fingerprint_value(results[output])
+                           for output in self.stages[stage_name].outputs})
+        self._remember(fingerprint, entry)
+        if self.stages[stage_name].persist:
+            cache = get_result_cache()
+            if cache is not None:
+                cache.set(fingerprint, entry)
+        return entry
+
+    def _remember(self, fingerprint, entry):
+        with self._lock:
+            self._memo[fingerprint] = entry
+            self._memo.move_to_end(fingerprint)
+            while len(self._memo) > self.memo_size:
+                self._memo.popitem(last=False)
+
+    def input_fingerprints(self, inputs):
+        return {
+            name: fingerprint_value(self.fingerprinters[name](value) if name in self.fingerprinters else value)
+            for name, value in inputs.items()
+        }
+
+    def run(self, outputs, **inputs):
+        """
+        Compute the requested outputs from the given inputs, running only
+        the stages they need and reusing memoized stage results.
+        """
+        values = dict(inputs)
+        fingerprints = self.input_fingerprints(inputs)
+
+        for stage_name in self.plan(outputs, provided=inputs):
+            stage = self.stages[stage_name]
+            fingerprint = self.fingerprint(stage, fingerprints)
+            entry = self._lookup_entry(stage_name, fingerprint)
+            if entry is None:
+                results = stage.fn(**{name: values[name] for name in stage.inputs})
+                missing = set(stage.outputs) - set(results)
+                if missing:
+                    raise ValueError(f"Stage {stage_name!r} did not produce {sorted(missing)}")
+                self.stats["runs"][stage_name] = self.stats["runs"].get(stage_name, 0) + 1
+                entry = self.store(stage_name, fingerprint, results)
+            results, output_fingerprints = entry
+            for output in stage.outputs:
+                values[output] = results[output]
+                fingerprints[output] = output_fingerprints[output]
+
+        return {output: values[output] for output in outputs}
+
+    def clear(self):
+        with self._lock:
+            self._memo.clear()
+
+
+def fingerprint_value(value):
+    """Content fingerprint of a raw input value."""
+    if isinstance(value, (bytes, bytearray)):
+        data = bytes(value)
+    elif isinstance(value, str):
+        data = value.encode("utf-8")
+    else:
+        try:
+            data = json.dumps(value, sort_keys=True, ensure_ascii=False).encode("utf-8")
+        except TypeError:
+            data = pickle.dumps(value)
+    return hashlib.sha256(data).hexdigest()
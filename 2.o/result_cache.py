@@ -0,0 +1,293 @@
+import hashlib
+import os
+import pickle
+import sqlite3
+import threading
+import time
+
+# -----------------------------
+# 🔹 Persistent result cache
+# -----------------------------
+# Content-addressed cache for pipeline results (extracted text, analyses /
+# NER artifacts, match scores) shared by the UI, scripts and worker
+# processes. Keys are SHA-256 digests of the input bytes plus everything
+# that changes the output (model, taxonomy version, PIPELINE_VERSION), so a
+# stale entry is never served: it simply stops being looked up and ages out.
+#
+# Storage is one SQLite file in WAL mode: readers never block, writers from
+# several processes are serialized by SQLite's own locking. Lookups do not
+# write: access times are collected in memory and flushed in batches, so
+# the LRU order is approximate. Total value size is kept under max_bytes by
+# evicting least-recently-used entries; triggers keep the total in the
+# meta table, so no write has to sum the whole table.
+#
+# The cache never breaks a computation: if the database cannot be opened,
+# read or written (read-only directory, locked file, full disk), lookups
+# miss, stores are skipped and a warning is printed once.
+
+PIPELINE_VERSION = "1"     # bump when any stage's output format or logic changes
+CACHE_PATH_ENV = "RESULT_CACHE_PATH"   # set to "none" to disable the cache
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+TOUCH_BATCH = 256          # flush access times after this many hits...
+TOUCH_INTERVAL = 30.0      # ...or this many seconds
+
+
+def user_cache_dir():
+    """Per-user cache directory for this app (%LOCALAPPDATA%, $XDG_CACHE_HOME or ~/.cache)."""
+    base = os.environ.get("LOCALAPPDATA") if os.name == "nt" else os.environ.get("XDG_CACHE_HOME")
+    return os.path.join(base or os.path.join(os.path.expanduser("~"), ".cache"), "resume-jd-matcher")
+
+
+DEFAULT_CACHE_PATH = os.path.join(user_cache_dir(), "result_cache.sqlite")
+
+# One transaction, so no process can write between the total being seeded
+# and the triggers that maintain it being created
+_SCHEMA = """
+BEGIN IMMEDIATE;
+CREATE TABLE IF NOT EXISTS entries (
+    key       TEXT PRIMARY KEY,
+    kind      TEXT NOT NULL,
+    value     BLOB NOT NULL,
+    size      INTEGER NOT NULL,
+    created   REAL NOT NULL,
+    accessed  REAL NOT NULL,
+    expires   REAL
+);
+CREATE INDEX IF NOT EXISTS entries_accessed ON entries (accessed);
+CREATE INDEX IF NOT EXISTS entries_expires ON entries (expires);
+CREATE TABLE IF NOT EXISTS meta (
+    name      TEXT PRIMARY KEY,
+    value     INTEGER NOT NULL
+);
+INSERT OR IGNORE INTO meta SELECT 'total_size', COALESCE(SUM(size), 0) FROM entries;
+CREATE TRIGGER IF NOT EXISTS entries_insert AFTER INSERT ON entries BEGIN
+    UPDATE meta SET value = value + new.size WHERE name = 'total_size';
+END;
+CREATE TRIGGER IF NOT EXISTS entries_update AFTER UPDATE OF size ON entries BEGIN
+    UPDATE meta SET value = value + new.size - old.size WHERE name = 'total_size';
+END;
+CREATE TRIGGER IF NOT EXISTS entries_delete AFTER DELETE ON entries BEGIN
+    UPDATE meta SET value = value - old.size WHERE name = 'total_size';
+END;
+COMMIT;
+"""
+
+
+def content_key(kind, *parts):
+    """
+    Cache key for kind ("text", "analysis", "match", ...) over parts, which
+    may be bytes, str or anything with a stable str(). Parts are length-
+    prefixed so ("ab", "c") and ("a", "bc") never collide.
+    """
+    h = hashlib.sha256(PIPELINE_VERSION.encode("utf-8"))
+    for part in parts:
+        if isinstance(part, str):
+            part = part.encode("utf-8")
+        elif not isinstance(part, (bytes, bytearray, memoryview)):
+            part = str(part).encode("utf-8")
+        h.update(len(part).to_bytes(8, "little"))
+        h.update(part)
+    return f"{kind}:{h.hexdigest()}"
+
+
+class ResultCache:
+    """SQLite-backed LRU cache of pickled values, safe across threads and processes."""
+
+    def __init__(self, path=DEFAULT_CACHE_PATH, max_bytes=DEFAULT_MAX_BYTES):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.errors = 0
+        self._local = threading.local()
+        self._touched = {}
+        self._touch_lock = threading.Lock()
+        self._last_flush = time.monotonic()
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        conn = self._connect()
+        try:
+            conn.executescript(_SCHEMA)
+        except BaseException:
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+            raise
+
+    def _connect(self):
+        # One connection per thread and process (connections must not cross a fork)
+        conn = getattr(self._local, "conn", None)
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    def _failed(self, action, error):
+        if not self.errors:
+            print(f"⚠️ Result cache {self.path} could not {action} ({error}); continuing without it")
+        self.errors += 1
+
+    def get(self, key, default=None):
+        now = time.time()
+        try:
+            row = self._connect().execute(
+                "SELECT value, expires FROM entries WHERE key = ?", (key,)
+            ).fetchone()
+        except sqlite3.Error as e:
+            self._failed("read", e)
+            row = None
+        if row is None or (row[1] is not None and row[1] <= now):
+            self.misses += 1
+            return default
+        self._touch(key, now)
+        self.hits += 1
+        return pickle.loads(row[0])
+
+    def _touch(self, key, now):
+        # Hits only write once a batch is due, so readers stay off the write lock
+        with self._touch_lock:
+            self._touched[key] = now
+            due = (len(self._touched) >= TOUCH_BATCH
+                   or time.monotonic() - self._last_flush >= TOUCH_INTERVAL)
+        if due:
+            try:
+                self._write(lambda conn: None)
+            except sqlite3.Error as e:
+                self._failed("write", e)
+
+    def _write(self, action):
+        """Run action(conn) and flush pending access times in one write transaction."""
+        with self._touch_lock:
+            touched, self._touched = self._touched, {}
+            self._last_flush = time.monotonic()
+        conn = self._connect()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            conn.executemany(
+                "UPDATE entries SET accessed = MAX(accessed, ?) WHERE key = ?",
+                [(accessed, key) for key, accessed in touched.items()],
+            )
+            result = action(conn)
+            conn.execute("COMMIT")
+            return result
+        except BaseException:
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+            raise
+
+    def set(self, key, value, ttl=None):
+        """Store value under key (expiring after ttl seconds if given)."""
+        blob = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        if len(blob) > self.max_bytes:
+            return False
+        now = time.time()
+        kind = key.split(":", 1)[0]
+
+        def store(conn):
+            conn.execute(
+                "INSERT INTO entries VALUES (?, ?, ?, ?, ?, ?, ?) ON CONFLICT (key) DO UPDATE SET "
+                "kind = excluded.kind, value = excluded.value, size = excluded.size, "
+                "created = excluded.created, accessed = excluded.accessed, expires = excluded.expires",
+                (key, kind, blob, len(blob), now, now, now + ttl if ttl else None),
+            )
+            self._evict(conn, now)
+
+        try:
+            self._write(store)
+        except sqlite3.Error as e:
+            self._failed("write", e)
+            return False
+        return True
+
+    def _total_size(self, conn):
+        return conn.execute("SELECT value FROM meta WHERE name = 'total_size'").fetchone()[0]
+
+    def _evict(self, conn, now):
+        conn.execute("DELETE FROM entries WHERE expires IS NOT NULL AND expires <= ?", (now,))
+        total = self._total_size(conn)
+        if total <= self.max_bytes:
+            return
+        freed = 0
+        victims = []
+        for key, size in conn.execute("SELECT key, size FROM entries ORDER BY accessed"):
+            victims.append((key,))
+            freed += size
+            if total - freed <= self.max_bytes:
+                break
+        conn.executemany("DELETE FROM entries WHERE key = ?", victims)
+
+    def memoize(self, key, compute, ttl=None):
+        """Return the cached value for key, computing and storing it on a miss."""
+        missing = object()
+        value = self.get(key, missing)
+        if value is missing:
+            value = compute()
+            self.set(key, value, ttl=ttl)
+        return value
+
+    def delete(self, key):
+        try:
+            self._write(lambda conn: conn.execute("DELETE FROM entries WHERE key = ?", (key,)))
+        except sqlite3.Error as e:
+            self._failed("write", e)
+
+    def clear(self, kind=None):
+        conn = self._connect()
+        if kind is None:
+            conn.execute("DELETE FROM entries")
+        else:
+            conn.execute("DELETE FROM entries WHERE kind = ?", (kind,))
+
+    def stats(self):
+        conn = self._connect()
+        entries = conn.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+        size = self._total_size(conn)
+        lookups = self.hits + self.misses
+        return {
+            "entries": entries,
+            "bytes": size,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "errors": self.errors,
+        }
+
+
+# -----------------------------
+# 🔹 Shared Cache
+# -----------------------------
+_default_cache = None
+_default_lock = threading.Lock()
+_unusable_paths = set()
+
+
+def get_result_cache():
+    """
+    The process-wide ResultCache ($RESULT_CACHE_PATH, by default in the user
+    cache directory), or None if disabled or the database cannot be opened.
+    """
+    global _default_cache
+    path = os.environ.get(CACHE_PATH_ENV, DEFAULT_CACHE_PATH)
+    if path.lower() == "none" or path in _unusable_paths:
+        return None
+    if _default_cache is None or _default_cache.path != path:
+        with _default_lock:
+            if _default_cache is None or _default_cache.path != path:
+                try:
+                    _default_cache = ResultCache(path)
+                except (sqlite3.Error, OSError) as e:
+                    print(f"⚠️ Result cache {path} is unavailable ({e}); continuing without it")
+                    _unusable_paths.add(path)
+                    return None
+    return _default_cache
+
+
+def cached(key, compute, ttl=None):
+    """memoize() through the shared cache; just computes when caching is disabled."""
+    cache = get_result_cache()
+    if cache is None:
+        return compute()
+    return cache.memoize(key, compute, ttl=ttl)
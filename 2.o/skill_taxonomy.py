@@ -0,0 +1,321 @@
+import csv
+import hashlib
+import json
+import mmap
+import os
+import struct
+import threading
+from array import array
+
+from atomic_file import atomic_write
+from keyword_matcher import KeywordMatcher, MappedKeywordMatcher, normalize_keyword
+
+# -----------------------------
+# 🔹 External skill taxonomy
+# -----------------------------
+# A taxonomy (skills + aliases + categories) is read from CSV/JSON once and
+# compiled into a binary index next to it (<source>.skidx). Workers then
+# memory-map the index instead of re-parsing the source: the keyword
+# automaton is stored as flat int32 tables and used in place.
+#
+# CSV columns:  skill, aliases ("|" or ";" separated), category
+# JSON:         [{"skill": ..., "aliases": [...], "category": ...}, ...]
+#               or {"<skill>": {"aliases": [...], "category": ...}, ...}
+
+TAXONOMY_ENV = "SKILL_TAXONOMY_PATH"
+INDEX_SUFFIX = ".skidx"
+INDEX_MAGIC = b"SKTX"
+INDEX_FORMAT_VERSION = 1
+BUILTIN_VERSION = "builtin"
+
+_PREAMBLE = struct.Struct("<4sII")  # magic, format version, header length
+_INT_SECTIONS = [
+    "edge_start", "edge_char", "edge_target", "fail", "dict_link",
+    "state_pattern", "pattern_length", "pattern_boundary",
+    "pattern_skill", "skill_category", "skill_name_offsets",
+]
+
+
+# -----------------------------
+# 🔹 Source Parsing
+# -----------------------------
+def _split_aliases(value):
+    if not value:
+        return []
+    if isinstance(value, str):
+        value = value.replace(";", "|").split("|")
+    return [v.strip() for v in value if v and v.strip()]
+
+
+def parse_taxonomy_source(source_path):
+    """Read a CSV/JSON taxonomy into {skill: {"aliases": set, "category": str}}."""
+    entries = {}
+
+    def add(skill, aliases, category):
+        name = normalize_keyword(skill or "")
+        if not name:
+            return
+        entry = entries.setdefault(name, {"aliases": set(), "category": ""})
+        entry["aliases"].update(normalize_keyword(a) for a in _split_aliases(aliases))
+        entry["aliases"].discard(name)
+        if category and not entry["category"]:
+            entry["category"] = category.strip()
+
+    if source_path.lower().endswith(".json"):
+        with open(source_path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        if isinstance(data, dict) and "skills" in data:
+            data = data["skills"]
+        if isinstance(data, dict):
+            for skill, info in data.items():
+                if isinstance(info, dict):
+                    add(skill, info.get("aliases"), info.get("category"))
+                else:
+                    add(skill, info, None)
+        else:
+            for item in data:
+                add(item.get("skill") or item.get("name"), item.get("aliases"), item.get("category"))
+    else:
+        with open(source_path, "r", encoding="utf-8", newline="") as f:
+            for row in csv.DictReader(f):
+                add(row.get("skill") or row.get("name"), row.get("aliases"), row.get("category"))
+    return entries
+
+
+# -----------------------------
+# 🔹 Index Compilation
+# -----------------------------
+def _source_version(source_path):
+    h = hashlib.sha256()
+    with open(source_path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()[:16]
+
+
+def default_index_path(source_path):
+    return source_path + INDEX_SUFFIX
+
+
+def compile_taxonomy(source_path, index_path=None):
+    """Parse the taxonomy source and write its binary index; returns the index path."""
+    index_path = index_path or default_index_path(source_path)
+    stat = os.stat(source_path)
+    entries = parse_taxonomy_source(source_path)
+
+    skills = sorted(entries)
+    categories = sorted({e["category"] for e in entries.values()})
+    category_ids = {c: i for i, c in enumerate(categories)}
+
+    matcher = KeywordMatcher()
+    for skill_id, skill in enumerate(skills):
+        matcher.add(skill, skill_id)
+        for alias in sorted(entries[skill]["aliases"]):
+            matcher.add(alias, skill_id)   # first skill claiming an alias wins
+    tables = matcher.compile().to_tables()
+    tables["pattern_skill"] = [labels[0] for labels in matcher._labels]
+    tables["skill_category"] = [category_ids[entries[s]["category"]] for s in skills]
+
+    name_blob = bytearray()
+    offsets = [0]
+    for skill in skills:
+        name_blob += skill.encode("utf-8")
+        offsets.append(len(name_blob))
+    tables["skill_name_offsets"] = offsets
+
+    # Lay sections out back to back, 8-byte aligned
+    sections = {}
+    payload = bytearray()
+    for name in _INT_SECTIONS:
+        data = array("i", tables[name]).tobytes()
+        sections[name] = [len(payload), len(data)]
+        payload += data + b"\0" * (-len(data) % 8)
+    sections["skill_names"] = [len(payload), len(name_blob)]
+    payload += name_blob
+
+    header = json.dumps({
+        "version": _source_version(source_path),
+        "source_size": stat.st_size,
+        "source_mtime_ns": stat.st_mtime_ns,
+        "skills": len(skills),
+        "patterns": len(matcher),
+        "categories": categories,
+        "sections": sections,
+    }).encode("utf-8")
+    header += b" " * (-(len(header) + _PREAMBLE.size) % 8)
+
+    with atomic_write(index_path) as f:   # safe for concurrent workers and threads
+        f.write(_PREAMBLE.pack(INDEX_MAGIC, INDEX_FORMAT_VERSION, len(header)))
+        f.write(header)
+        f.write(payload)
+    return index_path
+
+
+def _read_index_header(index_path):
+    with open(index_path, "rb") as f:
+        magic, fmt, header_len = _PREAMBLE.unpack(f.read(_PREAMBLE.size))
+        if magic != INDEX_MAGIC or fmt != INDEX_FORMAT_VERSION:
+            return None
+        return json.loads(f.read(header_len)), _PREAMBLE.size + header_len
+
+
+# -----------------------------
+# 🔹 Loaded Taxonomy
+# -----------------------------
+class _SkillNames:
+    """Skill names decoded on demand from the mapped name blob."""
+
+    def __init__(self, blob, offsets):
+        self._blob = blob
+        self._offsets = offsets
+
+    def __len__(self):
+        return len(self._offsets) - 1
+
+    def __getitem__(self, skill_id):
+        return bytes(self._blob[self._offsets[skill_id]:self._offsets[skill_id + 1]]).decode("utf-8")
+
+
+class _PatternView:
+    """Maps pattern id -> value through the pattern_skill table."""
+
+    def __init__(self, pattern_skill, lookup):
+        self._pattern_skill = pattern_skill
+        self._lookup = lookup
+
+    def __getitem__(self, pid):
+        return self._lookup(self._pattern_skill[pid])
+
+
+class SkillTaxonomy:
+    """A memory-mapped, versioned skill taxonomy with alias-aware matching."""
+
+    def __init__(self, source_path, index_path):
+        self.source_path = source_path
+        self.index_path = index_path
+
+        header, data_start = _read_index_header(index_path)
+        self.version = header["version"]
+        self.categories = header["categories"]
+        self._source_size = header["source_size"]
+        self._source_mtime_ns = header["source_mtime_ns"]
+
+        with open(index_path, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        view = memoryview(self._mmap)[data_start:]
+
+        tables = {}
+        for name in _INT_SECTIONS:
+            offset, length = header["sections"][name]
+            tables[name] = view[offset:offset + length].cast("i")
+        offset, length = header["sections"]["skill_names"]
+
+        self.skills = _SkillNames(view[offset:offset + length], tables["skill_name_offsets"])
+        self._skill_category = skill_category = tables["skill_category"]
+        self._skill_ids = None
+        categories = self.categories
+        # The views must not reference self: without a cycle, a replaced
+        # taxonomy is unmapped by refcounting once the last lookup using
+        # it returns, never while one is still running
+        self.matcher = MappedKeywordMatcher(
+            tables,
+            canonical=_PatternView(tables["pattern_skill"], self.skills.__getitem__),
+            labels=_PatternView(
+                tables["pattern_skill"],
+                lambda skill_id: (categories[skill_category[skill_id]],),
+            ),
+        )
+
+    def __len__(self):
+        return len(self.skills)
+
+    def is_stale(self):
+        """True if the source file changed since this index was compiled."""
+        try:
+            stat = os.stat(self.source_path)
+        except OSError:
+            return False
+        return (stat.st_size, stat.st_mtime_ns) != (self._source_size, self._source_mtime_ns)
+
+    def find(self, text):
+        """KeywordHits with the canonical skill as keyword and its category as label."""
+        return self.matcher.find(text)
+
+    def find_skills(self, text):
+        return sorted({hit.keyword for hit in self.find(text)})
+
+    def category(self, skill):
+        if self._skill_ids is None:
+            self._skill_ids = {self.skills[i]: i for i in range(len(self.skills))}
+        skill_id = self._skill_ids.get(normalize_keyword(skill))
+        if skill_id is None:
+            return None
+        return self.categories[self._skill_category[skill_id]]
+
+
+def load_taxonomy(source_path, index_path=None, rebuild=False):
+    """
+    Load a taxonomy through its binary index, compiling the index only when
+    it is missing, from another format version, or older than the source.
+    """
+    index_path = index_path or default_index_path(source_path)
+    if not rebuild and os.path.exists(index_path):
+        header = _read_index_header(index_path)
+        stat = os.stat(source_path)
+        if header is None or (header[0]["source_size"], header[0]["source_mtime_ns"]) != (
+            stat.st_size, stat.st_mtime_ns
+        ):
+            rebuild = True
+    else:
+        rebuild = True
+
+    if rebuild:
+        compile_taxonomy(source_path, index_path)
+    return SkillTaxonomy(source_path, index_path)
+
+
+# -----------------------------
+# 🔹 Active Taxonomy
+# -----------------------------
+# The active taxonomy comes from set_active_taxonomy() or $SKILL_TAXONOMY_PATH
+# and is reloaded automatically when its source file changes. Its version is
+# part of downstream cache keys, so a reload invalidates cached results
+# without restarting the app.
+
+_active = None
+_active_lock = threading.Lock()
+
+
+def set_active_taxonomy(source_path, index_path=None):
+    global _active
+    taxonomy = load_taxonomy(source_path, index_path)
+    with _active_lock:
+        _active = taxonomy   # the old one is unmapped when its last user drops it
+    print(f"✅ Skill taxonomy loaded: {len(taxonomy)} skills (version {taxonomy.version})")
+    return taxonomy
+
+
+def clear_active_taxonomy():
+    """Go back to the built-in keyword dictionaries."""
+    global _active
+    with _active_lock:
+        _active = None
+
+
+def get_active_taxonomy():
+    """The active SkillTaxonomy (reloaded if its source changed), or None."""
+    taxonomy = _active
+    if taxonomy is None:
+        source_path = os.environ.get(TAXONOMY_ENV)
+        if not source_path:
+            return None
+        return set_active_taxonomy(source_path)
+    if taxonomy.is_stale():
+        return set_active_taxonomy(taxonomy.source_path, taxonomy.index_path)
+    return taxonomy
+
+
+def taxonomy_version():
+    """Version tag of the skill dictionary currently in use."""
+    taxonomy = get_active_taxonomy()
+    return taxonomy.version if taxonomy is not None else BUILTIN_VERSION
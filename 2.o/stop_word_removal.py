@@ -1,52 +1,79 @@
-## Before parsing
-
-
-# import nltk
-# from nltk.corpus import stopwords
-# import os
-#
-# nltk.download("stopwords", quiet=True)
-#
-# def remove_stopwords(text):
-#     """Remove English stopwords from text."""
-#     words = text.split()
-#     stop_words = set(stopwords.words("english"))
-#     filtered_words = [word for word in words if word.lower() not in stop_words]
-#     return " ".join(filtered_words)
-#
-# if __name__ == "__main__":
-#     input_file = os.path.join("preprocessing_output_CV", "normalized_text.txt")
-#     output_dir = "preprocessing_output_CV"
-#     os.makedirs(output_dir, exist_ok=True)
-#     output_file = os.path.join(output_dir, "no_stopwords_text.txt")
-#
-#     with open(input_file, "r", encoding="utf-8") as f:
-#         text = f.read()
-#
-#     cleaned_text = remove_stopwords(text)
-#
-#     with open(output_file, "w", encoding="utf-8") as f:
-#         f.write(cleaned_text)
-#
-#     print(f"✅ Stopword-removed text saved to '{output_file}'")
-
-
-
-## After Parsing
-
-import nltk
-from nltk.corpus import stopwords
 import os
-
-nltk.download("stopwords", quiet=True)
+from array import array
+
+# -----------------------------
+# 🔹 Bundled stop-word list
+# -----------------------------
+# NLTK's English list, frozen in-source: no nltk.download at import, no
+# network, no corpus files, and the set is built once when the module
+# loads instead of on every call. Tech terms that collide with stop words
+# (single-letter languages and the like) are whitelisted and never
+# removed.
+
+NLTK_ENGLISH = frozenset("""
+i me my myself we our ours ourselves you you're you've you'll you'd your yours yourself
+yourselves he him his himself she she's her hers herself it it's its itself they them their
+theirs themselves what which who whom this that that'll these those am is are was were be
+been being have has had having do does did doing a an the and but if or because as until
+while of at by for with about against between into through during before after above below
+to from up down in out on off over under again further then once here there when where why
+how all any both each few more most other some such no nor not only own same so than too
+very s t can will just don don't should should've now d ll m o re ve y ain aren aren't
+couldn couldn't didn didn't doesn doesn't hadn hadn't hasn hasn't haven haven't isn isn't
+ma mightn mightn't mustn mustn't needn needn't shan shan't shouldn shouldn't wasn wasn't
+weren weren't won won't wouldn wouldn't
+""".split())
+
+# Never removed, whatever the stop-word list says (compared lowercased)
+TECH_WHITELIST = frozenset({
+    "c", "r", "d", "go", "c++", "c#", "f#", ".net", "ai", "ml", "ui", "ux", "qa",
+})
+
+# Kept only in this exact casing ("IT" the field, "it" the pronoun)
+CASE_SENSITIVE_KEEP = frozenset({"IT"})
+
+STOP_WORDS = NLTK_ENGLISH - TECH_WHITELIST
+
+
+# -----------------------------
+# 🔹 Filtering
+# -----------------------------
+
+def is_stopword(token):
+    return token.lower() in STOP_WORDS and token not in CASE_SENSITIVE_KEEP
+
+
+def filter_stopwords(tokens, stop_words=STOP_WORDS):
+    """Tokens without stop words (case-insensitive), in their original order."""
+    return [t for t in tokens if t.lower() not in stop_words or t in CASE_SENSITIVE_KEEP]
+
+
+def filter_stopwords_batch(documents, stop_words=STOP_WORDS):
+    """
+    filter_stopwords over a corpus: yields one filtered token list per
+    document, lazily. Documents may be token lists or whitespace-separated
+    strings.
+    """
+    for tokens in documents:
+        yield filter_stopwords(tokens.split() if isinstance(tokens, str) else tokens, stop_words)
+
+
+def filter_stopwords_with_spans(tokens, spans, stop_words=STOP_WORDS):
+    """
+    filter_stopwords plus the flat [start, end, ...] span array of the kept
+    tokens, taken from spans (aligned with tokens).
+    """
+    kept, kept_spans = [], array("I")
+    for i, token in enumerate(tokens):
+        if token.lower() not in stop_words or token in CASE_SENSITIVE_KEEP:
+            kept.append(token)
+            kept_spans.extend(spans[2 * i:2 * i + 2])
+    return kept, kept_spans
 
 
 def remove_stopwords(text):
     """Remove English stopwords from parsed text."""
-    words = text.split()
-    stop_words = set(stopwords.words("english"))
-    filtered_words = [word for word in words if word.lower() not in stop_words]
-    return " ".join(filtered_words)
+    return " ".join(filter_stopwords(text.split()))
 
 
 if __name__ == "__main__":
@@ -1,52 +1,16 @@
-## Before parsing
-
-
-# import nltk
-# from nltk.corpus import stopwords
-# import os
-#
-# nltk.download("stopwords", quiet=True)
-#
-# def remove_stopwords(text):
-#     """Remove English stopwords from text."""
-#     words = text.split()
-#     stop_words = set(stopwords.words("english"))
-#     filtered_words = [word for word in words if word.lower() not in stop_words]
-#     return " ".join(filtered_words)
-#
-# if __name__ == "__main__":
-#     input_file = os.path.join("preprocessing_output_JD", "normalized_text.txt")
-#     output_dir = "preprocessing_output_JD"
-#     os.makedirs(output_dir, exist_ok=True)
-#     output_file = os.path.join(output_dir, "no_stopwords_text.txt")
-#
-#     with open(input_file, "r", encoding="utf-8") as f:
-#         text = f.read()
-#
-#     cleaned_text = remove_stopwords(text)
-#
-#     with open(output_file, "w", encoding="utf-8") as f:
-#         f.write(cleaned_text)
-#
-#     print(f"✅ Stopword-removed text saved to '{output_file}'")
-
-
-
-## After Parsing
-
-import nltk
-from nltk.corpus import stopwords
 import os
 
-nltk.download("stopwords", quiet=True)
-
-
-def remove_stopwords(text):
-    """Remove English stopwords from parsed text."""
-    words = text.split()
-    stop_words = set(stopwords.words("english"))
-    filtered_words = [word for word in words if word.lower() not in stop_words]
-    return " ".join(filtered_words)
+# Same bundled stop-word engine as the CV side
+from stop_word_removal import (
+    CASE_SENSITIVE_KEEP,
+    STOP_WORDS,
+    TECH_WHITELIST,
+    filter_stopwords,
+    filter_stopwords_batch,
+    filter_stopwords_with_spans,
+    is_stopword,
+    remove_stopwords,
+)
 
 
 if __name__ == "__main__":
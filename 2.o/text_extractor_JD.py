@@ -1,13 +1,19 @@
-import fitz  # PyMuPDF
 import os
 
-def extract_text_from_pdf(pdf_path):
-    """Extract raw text from a PDF file."""
-    doc = fitz.open(pdf_path)
-    text = ""
-    for page in doc:
-        text += page.get_text()
-    return text
+from pdf_extraction import extract_pdf_text
+from result_cache import cached, content_key
+
+def extract_text_from_pdf(pdf_path, max_pages=None, max_chars=None):
+    """
+    Extract raw text from a PDF file (PyMuPDF, falling back to pdfplumber).
+    Results are cached by the file's bytes, so re-extracting is a lookup.
+    """
+    with open(pdf_path, "rb") as f:
+        data = f.read()
+    return cached(
+        content_key("text", data, max_pages, max_chars),
+        lambda: extract_pdf_text(data, max_pages=max_pages, max_chars=max_chars),
+    )
 
 if __name__ == "__main__":
     pdf_path = "ML.pdf"
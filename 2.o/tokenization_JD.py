@@ -1,20 +1,17 @@
-import spacy
 import os
+from analysis import analyze_document, token_texts
+from nlp_models import resolve_model, run_stage
 
-# Load spaCy small English model for tokenization
-nlp = spacy.load("en_core_web_trf")
-
-def tokenize_text(text):
+def tokenize_text(text, tier=None):
     """Tokenize text using spaCy while preserving important technical terms."""
-    doc = nlp(text)
-    tokens = []
-    for token in doc:
-        # Skip spaces and punctuation
-        if token.is_space or token.is_punct:
-            continue
-        # Keep hyphenated or joined words intact (like scikit-learn, tensorflow)
-        tokens.append(token.text)
-    return tokens
+    # Spaces and punctuation are skipped; hyphenated or joined words
+    # (like scikit-learn, tensorflow) stay intact. On the analysis model the
+    # same spaCy pass also serves parsing and NER for this text; on any
+    # other tier only the tokenizer runs.
+    model = resolve_model(tier, "tokenize")
+    if model == resolve_model(None, "analysis"):
+        return list(analyze_document(text, model)["tokens"])
+    return token_texts(run_stage(text, "tokenize", model))
 
 
 if __name__ == "__main__":
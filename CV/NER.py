@@ -1,7 +1,11 @@
-import spacy
+import os
+import sys
 
-# Load best spaCy model
-nlp = spacy.load("en_core_web_trf")
+# Load best spaCy model through the shared registry in the 2.o backend
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "2.o"))
+from nlp_models import get_nlp
+
+nlp = get_nlp("en_core_web_trf")
 
 # === Step 1: Read text from your file ===
 with open("1(tokenized).txt", "r", encoding="utf-8") as f:
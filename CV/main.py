@@ -1,97 +1,146 @@
-import fitz  # PyMuPDF
 import nltk
 import string
-import spacy
-from nltk.corpus import stopwords
+import sys
 from nltk.tokenize import word_tokenize
 from nltk import pos_tag
 import os
 
+# Shared spaCy model registry and stop-word list live in the 2.o backend
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "2.o"))
+from nlp_models import run_stage
+from pdf_extraction import extract_pdf_text
+from pipeline_graph import PipelineGraph
+from stop_word_removal import filter_stopwords
+
 # Download necessary resources
 nltk.download('punkt')
-nltk.download('stopwords')
 nltk.download('averaged_perceptron_tagger')
 
-# Load SpaCy model for NER
-nlp = spacy.load("en_core_web_sm")
+# SpaCy model tier for NER (loaded lazily through the shared registry)
+NER_MODEL = "fast"
 
-# === 1️⃣ PDF TEXT EXTRACTION ===
-def extract_text_from_pdf(pdf_path, output_file="extracted_text.txt"):
-    doc = fitz.open(pdf_path)
-    text = ""
-    for page in doc:
-        text += page.get_text()
+# How each intermediate is written when it is saved
+FORMATTERS = {
+    "tokens": " ".join,
+    "no_stopwords": " ".join,
+    "pos_tags": lambda tags: "".join(f"{word}/{tag} " for word, tag in tags),
+    "entities": lambda entities: "".join(f"{ent} --> {label}\n" for ent, label in entities),
+}
+
+OUTPUT_FILES = {
+    "extracted": "extracted_text.txt",
+    "normalized": "normalized_text.txt",
+    "no_punctuation": "no_punctuation.txt",
+    "tokens": "tokens.txt",
+    "no_stopwords": "no_stopwords.txt",
+    "pos_tags": "pos_tags.txt",
+    "entities": "ner_output.txt",
+}
+
+def save_output(name, value, output_file):
     with open(output_file, "w", encoding="utf-8") as f:
-        f.write(text)
-    print(f"[1] Extracted text saved as {output_file}")
+        f.write(FORMATTERS.get(name, str)(value))
+
+# Every step only writes its file when given an output_file
+
+# === 1️⃣ PDF TEXT EXTRACTION ===
+def extract_text_from_pdf(pdf_path, output_file=None):
+    text = extract_pdf_text(pdf_path)
+    if output_file:
+        save_output("extracted", text, output_file)
+        print(f"[1] Extracted text saved as {output_file}")
     return text
 
 # === 2️⃣ NORMALIZATION (Lowercasing) ===
-def normalize_text(text, output_file="normalized_text.txt"):
+def normalize_text(text, output_file=None):
     normalized = text.lower()
-    with open(output_file, "w", encoding="utf-8") as f:
-        f.write(normalized)
-    print(f"[2] Normalized text saved as {output_file}")
+    if output_file:
+        save_output("normalized", normalized, output_file)
+        print(f"[2] Normalized text saved as {output_file}")
     return normalized
 
 # === 3️⃣ PUNCTUATION REMOVAL ===
-def remove_punctuation(text, output_file="no_punctuation.txt"):
+def remove_punctuation(text, output_file=None):
     cleaned = text.translate(str.maketrans("", "", string.punctuation))
-    with open(output_file, "w", encoding="utf-8") as f:
-        f.write(cleaned)
-    print(f"[3] Text without punctuation saved as {output_file}")
+    if output_file:
+        save_output("no_punctuation", cleaned, output_file)
+        print(f"[3] Text without punctuation saved as {output_file}")
     return cleaned
 
 # === 4️⃣ TOKENIZATION ===
-def tokenize_text(text, output_file="tokens.txt"):
+def tokenize_text(text, output_file=None):
     tokens = word_tokenize(text)
-    with open(output_file, "w", encoding="utf-8") as f:
-        f.write(" ".join(tokens))
-    print(f"[4] Tokens saved as {output_file}")
+    if output_file:
+        save_output("tokens", tokens, output_file)
+        print(f"[4] Tokens saved as {output_file}")
     return tokens
 
 # === 5️⃣ STOPWORD REMOVAL ===
-def remove_stopwords(tokens, output_file="no_stopwords.txt"):
-    stop_words = set(stopwords.words('english'))
-    filtered = [w for w in tokens if w.lower() not in stop_words]
-    with open(output_file, "w", encoding="utf-8") as f:
-        f.write(" ".join(filtered))
-    print(f"[5] Stopwords removed and saved as {output_file}")
+def remove_stopwords(tokens, output_file=None):
+    filtered = filter_stopwords(tokens)  # bundled list, no download
+    if output_file:
+        save_output("no_stopwords", filtered, output_file)
+        print(f"[5] Stopwords removed and saved as {output_file}")
     return filtered
 
 # === 6️⃣ POS TAGGING ===
-def pos_tagging(tokens, output_file="pos_tags.txt"):
+def pos_tagging(tokens, output_file=None):
     tags = pos_tag(tokens)
-    with open(output_file, "w", encoding="utf-8") as f:
-        for word, tag in tags:
-            f.write(f"{word}/{tag} ")
-    print(f"[6] POS tagging saved as {output_file}")
+    if output_file:
+        save_output("pos_tags", tags, output_file)
+        print(f"[6] POS tagging saved as {output_file}")
     return tags
 
 # === 7️⃣ NAMED ENTITY RECOGNITION ===
-def named_entity_recognition(text, output_file="ner_output.txt"):
-    doc = nlp(text)
+def named_entity_recognition(text, output_file=None):
+    doc = run_stage(text, "ner", NER_MODEL)  # skips tagger/parser/lemmatizer
     entities = [(ent.text, ent.label_) for ent in doc.ents]
-    with open(output_file, "w", encoding="utf-8") as f:
-        for ent, label in entities:
-            f.write(f"{ent} --> {label}\n")
-    print(f"[7] Named Entities saved as {output_file}")
+    if output_file:
+        save_output("entities", entities, output_file)
+        print(f"[7] Named Entities saved as {output_file}")
     return entities
 
+# === PIPELINE GRAPH ===
+# Each step declares what it reads and produces; full_pipeline only runs
+# the steps the requested outputs need, and results are memoized per input.
+CV_GRAPH = PipelineGraph("cv_main")
+CV_GRAPH.add_stage("extract", lambda pdf_bytes: {"extracted": extract_text_from_pdf(pdf_bytes)},
+                   ("pdf_bytes",), ("extracted",))
+CV_GRAPH.add_stage("normalize", lambda extracted: {"normalized": normalize_text(extracted)},
+                   ("extracted",), ("normalized",))
+CV_GRAPH.add_stage("punctuation", lambda normalized: {"no_punctuation": remove_punctuation(normalized)},
+                   ("normalized",), ("no_punctuation",))
+CV_GRAPH.add_stage("tokenize", lambda no_punctuation: {"tokens": tokenize_text(no_punctuation)},
+                   ("no_punctuation",), ("tokens",))
+CV_GRAPH.add_stage("stopwords", lambda tokens: {"no_stopwords": remove_stopwords(tokens)},
+                   ("tokens",), ("no_stopwords",))
+CV_GRAPH.add_stage("pos", lambda no_stopwords: {"pos_tags": pos_tagging(no_stopwords)},
+                   ("no_stopwords",), ("pos_tags",))
+CV_GRAPH.add_stage("ner", lambda no_stopwords: {"entities": named_entity_recognition(" ".join(no_stopwords))},
+                   ("no_stopwords",), ("entities",), depends=(lambda: NER_MODEL,))
+
 # === MAIN PIPELINE ===
-def full_pipeline(pdf_path, output_dir="Outputs"):
+def full_pipeline(pdf_path, output_dir="Outputs", outputs=("entities",), save_intermediates=False):
+    """
+    Compute the requested outputs (keys of OUTPUT_FILES) for a PDF and save
+    them to output_dir. Steps no requested output depends on are skipped;
+    other intermediates are only written with save_intermediates=True.
+    """
     os.makedirs(output_dir, exist_ok=True)
 
-    extracted = extract_text_from_pdf(pdf_path, os.path.join(output_dir, "extracted_text.txt"))
-    normalized = normalize_text(extracted, os.path.join(output_dir, "normalized_text.txt"))
-    no_punct = remove_punctuation(normalized, os.path.join(output_dir, "no_punctuation.txt"))
-    tokens = tokenize_text(no_punct, os.path.join(output_dir, "tokens.txt"))
-    no_stop = remove_stopwords(tokens, os.path.join(output_dir, "no_stopwords.txt"))
-    pos_tags = pos_tagging(no_stop, os.path.join(output_dir, "pos_tags.txt"))
-    entities = named_entity_recognition(" ".join(no_stop), os.path.join(output_dir, "ner_output.txt"))
+    with open(pdf_path, "rb") as f:
+        pdf_bytes = f.read()
+    wanted = list(OUTPUT_FILES) if save_intermediates else list(outputs)
+    results = CV_GRAPH.run(wanted, pdf_bytes=pdf_bytes)
+
+    for name in wanted:
+        output_file = os.path.join(output_dir, OUTPUT_FILES[name])
+        save_output(name, results[name], output_file)
+        print(f"📄 {name} saved as {output_file}")
 
     print("\n✅ Pipeline completed successfully.")
-    print(f"All outputs saved in: {os.path.abspath(output_dir)}")
+    print(f"Outputs saved in: {os.path.abspath(output_dir)}")
+    return {name: results[name] for name in outputs}
 
 # === Run Example ===
 if __name__ == "__main__":
@@ -1,32 +1,9 @@
-import nltk
-nltk.download('stopwords')
-from nltk.corpus import stopwords
+import os
+import sys
 
-stop_words = set(stopwords.words('english'))
-
-def remove_stopwords(tokens):
-    return [w for w in tokens if w not in stop_words]
-
-# Example usage:
-filtered_tokens = remove_stopwords(tokens)
-print(filtered_tokens[:50])  # first 50 meaningful words
-
-
-
-
-
-
-
-
-
-
-
-
-import nltk
-from nltk.corpus import stopwords
-nltk.download('stopwords')
-nltk.download('punkt')
-from nltk.tokenize import word_tokenize
+# Bundled stop-word list from the 2.o backend (no nltk.download needed)
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "2.o"))
+from stop_word_removal import filter_stopwords
 
 # Read the tokenized text
 with open("1(tokenized).txt", 'r', encoding='utf-8') as f:
@@ -36,17 +13,14 @@ with open("1(tokenized).txt", 'r', encoding='utf-8') as f:
 # If you already saved as Python list string, you can use eval() safely here
 tokens = eval(txt)  # converts '[token1, token2, ...]' string back to list
 
-# Load stopwords
-stop_words = set(stopwords.words('english'))
-
 # Remove stopwords
 def remove_stopwords(tokens):
-    return [w for w in tokens if w.lower() not in stop_words]
+    return filter_stopwords(tokens)
 
 stop_wordless = remove_stopwords(tokens)
 
 # Save to file
-with open("1(stoped_word).txt", 'w', encoding="utf-8') as f:
+with open("1(stoped_word).txt", 'w', encoding='utf-8') as f:
     f.write(str(stop_wordless))
 
 print(stop_wordless[:50])  # preview first 50 words
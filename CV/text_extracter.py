@@ -1,5 +1,9 @@
 import fitz  # PyMuPDF
 import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "2.o"))
+from corpus_extractor import iter_corpus_texts
 
 def extract_text_from_pdf(pdf_path):
     doc = fitz.open(pdf_path)
@@ -8,14 +12,18 @@ def extract_text_from_pdf(pdf_path):
         text += page.get_text()
     return text
 
-# Example usage:
-folder = "resumes"
-all_texts = {}
-for file in os.listdir(folder):
-    if file.endswith(".pdf"):
-        path = os.path.join(folder, file)
-        text = extract_text_from_pdf(path)
-        all_texts[file] = text
+# Example usage: stream the folder through the worker pool and keep only
+# short previews, so memory does not grow with the number of PDFs.
+if __name__ == "__main__":
+    folder = "resumes"
+    previews = {}
+    for path, text, stats in iter_corpus_texts(folder):
+        if stats["error"]:
+            print(f"⚠️ {os.path.basename(path)}: {stats['error']}")
+            continue
+        if len(previews) < 5:
+            previews[os.path.basename(path)] = text[:500]
 
-print(list(all_texts.keys())[:5])  # show first 5 files
-print(all_texts[list(all_texts.keys())[0]][:500])  # preview first 500 chars
+    print(list(previews.keys()))  # show first 5 files
+    if previews:
+        print(next(iter(previews.values())))  # preview first 500 chars
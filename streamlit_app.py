@@ -1,8 +1,11 @@
 import os
 import sys
-import tempfile
+import hashlib
+import html
+import pickle
 import importlib.util
-from collections import Counter
+from collections import Counter, OrderedDict
+from contextlib import closing
 from docx import Document
 import io
 import streamlit as st
@@ -40,9 +43,21 @@ with st.sidebar:
     - Resume-JD Matching (Cosine Similarity)
     - Skill Gap Analysis
 
-    No external API calls required! Uses your local ML models.
+    Analysis and matching run on your local ML models. Only the optional
+    **AI Sentence Rewrites** section calls an external API (Gemini).
     """)
 
+    # fast = en_core_web_sm for interactive use, accurate = transformer
+    from nlp_models import DEFAULT_TIER, MODEL_TIERS
+    tier_names = list(MODEL_TIERS)
+    model_tier = st.selectbox(
+        "Model tier",
+        tier_names,
+        index=tier_names.index(DEFAULT_TIER) if DEFAULT_TIER in tier_names else len(tier_names) - 1,
+        format_func=lambda tier: f"{tier} ({MODEL_TIERS[tier]})",
+    )
+    model_name = MODEL_TIERS[model_tier]
+
 st.header("Inputs")
 col1, col2 = st.columns(2)
 
@@ -62,23 +77,154 @@ def extract_text_from_uploaded(uploaded):
         return ""
     name = uploaded.name.lower()
     data = uploaded.getvalue()
+    from pdf_extraction import MAX_UPLOAD_CHARS, MAX_UPLOAD_PAGES
     if name.endswith('.pdf'):
         try:
-            import pdfplumber
-            with tempfile.NamedTemporaryFile(delete=False, suffix=".pdf") as tmp:
-                tmp.write(data)
-                tmp.flush()
-                with pdfplumber.open(tmp.name) as pdf:
-                    text = "\n".join([p.extract_text() or "" for p in pdf.pages])
-            return text
+            from pdf_extraction import extract_pdf_text
+            from result_cache import cached, content_key
+            # Parsed straight from the upload buffer, decoding nothing past the
+            # upload budget; re-uploads are a cache lookup
+            return cached(
+                content_key("text", data, MAX_UPLOAD_PAGES, MAX_UPLOAD_CHARS),
+                lambda: extract_pdf_text(data, max_pages=MAX_UPLOAD_PAGES, max_chars=MAX_UPLOAD_CHARS),
+            )
         except Exception as e:
             st.warning(f"PDF extraction failed: {e}")
             return ""
     else:
         try:
-            return data.decode('utf-8')
+            return data[:MAX_UPLOAD_CHARS * 4].decode('utf-8', errors='ignore')[:MAX_UPLOAD_CHARS]
         except Exception:
-            return str(data)
+            return str(data[:MAX_UPLOAD_CHARS])
+
+
+# ========== RESULT CACHING ==========
+# Streamlit reruns the whole script on every widget interaction, so models are
+# held as cached resources and per-document results are memoized by a hash of
+# the input text: globally (bounded by entries + TTL) and per session (bounded
+# by bytes). Below both sits the on-disk result cache (2.o/result_cache.py),
+# which survives restarts and is shared with the CLI scripts.
+
+CACHE_TTL_SECONDS = 60 * 60
+CACHE_MAX_ENTRIES = 128
+SESSION_CACHE_MAX_BYTES = 64 * 1024 * 1024
+# Small batches so the first rewrites show up while the rest are in flight
+REWRITE_BATCH_SIZE = 2
+HIGHLIGHT_COLORS = {"matched": "#c3e6cb", "missing": "#f5c6cb"}
+
+
+def text_hash(text):
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+@st.cache_resource(show_spinner=False)
+def load_nlp_model(model_name):
+    from nlp_models import get_nlp
+    return get_nlp(model_name)
+
+
+@st.cache_data(max_entries=CACHE_MAX_ENTRIES, ttl=CACHE_TTL_SECONDS, show_spinner=False)
+def cached_analysis(doc_hash, model_name, taxonomy_version, _text):
+    """Tokens, parse rows and NER dict for a normalized text (keyed by its hash)."""
+    from analysis import analyze_document
+    load_nlp_model(model_name)
+    return analyze_document(_text, model_name)
+
+
+@st.cache_data(max_entries=CACHE_MAX_ENTRIES, ttl=CACHE_TTL_SECONDS, show_spinner=False)
+def cached_match(resume_hash, jd_hash, model_name, taxonomy_version, _resume_ner, _jd_ner):
+    """Match scores for a resume/JD pair (keyed by the hashes of both texts)."""
+    from Similarity.Resume_JD_Matching import score_ner_data
+    from nlp_models import model_identity
+    from result_cache import cached, content_key
+    return cached(
+        content_key("match", resume_hash, jd_hash, model_identity(model_name), taxonomy_version),
+        lambda: score_ner_data(_resume_ner, _jd_ner),
+    )
+
+
+def session_memo(key, compute):
+    """Per-session LRU in front of the global caches, capped at SESSION_CACHE_MAX_BYTES."""
+    cache = st.session_state.setdefault("_result_cache", OrderedDict())
+    sizes = st.session_state.setdefault("_result_cache_sizes", {})
+    if key in cache:
+        cache.move_to_end(key)
+        return cache[key]
+
+    value = compute()
+    size = len(pickle.dumps(value))
+    if size <= SESSION_CACHE_MAX_BYTES:
+        cache[key] = value
+        sizes[key] = size
+        while sum(sizes.values()) > SESSION_CACHE_MAX_BYTES:
+            evicted, _ = cache.popitem(last=False)
+            sizes.pop(evicted, None)
+    return value
+
+
+def current_taxonomy_version():
+    """Skill taxonomy version; part of every result key so a reload invalidates them."""
+    from skill_taxonomy import taxonomy_version
+    return taxonomy_version()
+
+
+def get_analysis(normalized_text):
+    doc_hash = text_hash(normalized_text)
+    version = current_taxonomy_version()
+    return session_memo(
+        ("analysis", doc_hash, model_name, version),
+        lambda: cached_analysis(doc_hash, model_name, version, normalized_text),
+    )
+
+
+def get_match(resume_normalized, jd_normalized, resume_ner, jd_ner):
+    resume_hash = text_hash(resume_normalized)
+    jd_hash = text_hash(jd_normalized)
+    version = current_taxonomy_version()
+    return session_memo(
+        ("match", resume_hash, jd_hash, model_name, version),
+        lambda: cached_match(resume_hash, jd_hash, model_name, version, resume_ner, jd_ner),
+    )
+
+
+def render_rewrite(result):
+    """One streamed rewriter result: original, rewrite, inferred skills and latency."""
+    number = result["index"] + 1
+    if result.get("error"):
+        st.warning(f"{number}. Kept the original sentence ({result['error']})")
+        st.markdown(f"> {result['original']}")
+        return
+    st.markdown(f"**{number}. Original:** {result['original']}")
+    st.markdown(f"**Rewrite:** {result['rewrite']}")
+    skills = ", ".join(result["skills"]) or "none"
+    st.caption(f"Inferred skills: {skills} · ready after {result['latency']:.1f}s")
+
+
+def skill_highlights(analysis, offsets, kinds):
+    """(start, end, kind) spans in the original text for every skill listed in kinds."""
+    from analysis import locate_keywords
+    return [
+        (start, end, kinds[skill])
+        for skill, spans in locate_keywords(analysis, offsets).items() if skill in kinds
+        for start, end in spans
+    ]
+
+
+def highlight_html(text, spans):
+    """text as HTML with its (start, end, kind) spans wrapped in colored <mark> tags."""
+    parts, pos = [], 0
+    for start, end, kind in sorted(spans):
+        if start < pos:
+            continue  # overlaps the previous highlight
+        parts.append(html.escape(text[pos:start]))
+        parts.append(f'<mark style="background-color: {HIGHLIGHT_COLORS[kind]};">'
+                     f'{html.escape(text[start:end])}</mark>')
+        pos = end
+    parts.append(html.escape(text[pos:]))
+    return (
+        '<div style="white-space: pre-wrap; max-height: 400px; overflow-y: auto; '
+        'padding: 10px; border: 1px solid #ddd; border-radius: 5px;">' + "".join(parts) + "</div>"
+    )
 
 
 resume_text = resume_text_area.strip() if resume_text_area.strip() else extract_text_from_uploaded(resume_file)
@@ -89,18 +235,19 @@ if not resume_text:
 
 run_btn = st.button("Run Enhancement")
 
+# Keep showing results on later reruns (expanders, downloads) as long as the
+# inputs are unchanged; everything below is served from the caches then.
+run_key = (text_hash(resume_text), text_hash(jd_text))
 if run_btn and resume_text:
+    st.session_state["last_run"] = run_key
+
+if resume_text and st.session_state.get("last_run") == run_key:
     st.info("Running local preprocessing pipeline — this may take a moment (spaCy models loading)...")
 
     # ========== LAZY IMPORTS (heavy modules) ==========
     try:
-        from normalization import normalize_text as norm_text_func
-        from tokenization import tokenize_text as tokenize_func
-        from stop_word_removal import remove_stopwords as remove_stopwords_func
-        from NER import perform_full_ner
-        from parsing import parse_tokens
-        import tempfile as tf
-        import ast
+        from normalization import normalize_with_offsets
+        from stop_word_removal import filter_stopwords
     except Exception as e:
         st.error(f"Failed to import 2.o modules: {e}")
         st.stop()
@@ -114,19 +261,21 @@ if run_btn and resume_text:
     if not jd_text_extracted:
         st.warning("⚠️ Job Description not provided. Proceeding with Resume analysis only.")
 
-    # Step 2: Normalize both texts
+    # Step 2: Normalize both texts (the offset maps lead back to the original text)
     try:
-        resume_normalized = norm_text_func(resume_text_extracted)
-        jd_normalized = norm_text_func(jd_text_extracted) if jd_text_extracted else ""
+        resume_normalized, resume_offsets = normalize_with_offsets(resume_text_extracted)
+        jd_normalized, jd_offsets = normalize_with_offsets(jd_text_extracted) if jd_text_extracted else ("", None)
         st.success("✅ Normalization complete")
     except Exception as e:
         st.error(f"Normalization failed: {e}")
         st.stop()
 
-    # Step 3: Tokenize
+    # Step 3: Tokenize (single spaCy pass per document; also yields parse + NER)
     try:
-        resume_tokens = tokenize_func(resume_normalized)
-        jd_tokens = tokenize_func(jd_normalized) if jd_normalized else []
+        resume_analysis = get_analysis(resume_normalized)
+        jd_analysis = get_analysis(jd_normalized) if jd_normalized else None
+        resume_tokens = resume_analysis["tokens"]
+        jd_tokens = jd_analysis["tokens"] if jd_analysis else []
         st.success("✅ Tokenization complete")
     except Exception as e:
         st.error(f"Tokenization failed: {e}")
@@ -134,34 +283,18 @@ if run_btn and resume_text:
 
     # Step 4: Remove stopwords
     try:
-        resume_tokens_str = " ".join(resume_tokens)
-        resume_no_stop = remove_stopwords_func(resume_tokens_str).split()
-
-        jd_tokens_str = " ".join(jd_tokens) if jd_tokens else ""
-        jd_no_stop = remove_stopwords_func(jd_tokens_str).split() if jd_tokens_str else []
+        resume_no_stop = filter_stopwords(resume_tokens)
+        jd_no_stop = filter_stopwords(jd_tokens)
 
         st.success("✅ Stop word removal complete")
     except Exception as e:
         st.error(f"Stop word removal failed: {e}")
         st.stop()
 
-    # Step 5: Perform NER on resume tokens (write to temp file first)
+    # Step 5: NER comes from the same analysis as tokenization
     try:
-        resume_ner_output = None
-        jd_ner_output = None
-
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.txt', delete=False) as f_resume:
-            f_resume.write(str(resume_tokens))
-            resume_tokens_file = f_resume.name
-
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.txt', delete=False) as f_jd:
-            f_jd.write(str(jd_tokens))
-            jd_tokens_file = f_jd.name
-
-        # Perform NER (returns structured dict)
-        resume_ner_output = perform_full_ner(resume_tokens_file, output_dir=tempfile.gettempdir())
-        if jd_tokens:
-            jd_ner_output = perform_full_ner(jd_tokens_file, output_dir=tempfile.gettempdir())
+        resume_ner_output = resume_analysis["ner"]
+        jd_ner_output = jd_analysis["ner"] if jd_tokens else None
 
         st.success("✅ NER complete")
     except Exception as e:
@@ -244,22 +377,10 @@ if run_btn and resume_text:
     if jd_text_extracted:
         with st.expander("Resume-JD Match Score", expanded=True):
             try:
-                # Import the local matching module
-                from Similarity.Resume_JD_Matching import match_resume_jd, load_ner_data
-
-                # Save NER data to temp files for matching
-                with tempfile.NamedTemporaryFile(mode='w', suffix='.txt', delete=False) as f:
-                    for k, v in resume_ner_output.items():
-                        f.write(f"{k}: {v}\n")
-                    resume_ner_file = f.name
-
-                with tempfile.NamedTemporaryFile(mode='w', suffix='.txt', delete=False) as f:
-                    for k, v in jd_ner_output.items():
-                        f.write(f"{k}: {v}\n")
-                    jd_ner_file = f.name
-
-                # Get match scores and overall match
-                match_scores, overall_match = match_resume_jd(resume_ner_file, jd_ner_file)
+                # Get match scores and overall match (memoized by text hashes)
+                match_scores, overall_match = get_match(
+                    resume_normalized, jd_normalized, resume_ner_output, jd_ner_output
+                )
 
                 # Display Overall Match prominently at top
                 st.markdown("### Overall Match Score")
@@ -343,6 +464,26 @@ if run_btn and resume_text:
                     else:
                         st.success("✅ All JD skills are present in Resume!")
 
+                # Skills highlighted in the original texts, located through the
+                # keyword spans of the analysis above (no extra model passes)
+                st.markdown("### 🔍 Skills in Context")
+                st.caption("Green: skills found in both documents · Red: JD skills missing from the resume")
+                jd_kinds = {skill: "matched" for skill in matched_skills}
+                jd_kinds.update({skill: "missing" for skill in missing_skills})
+
+                col1, col2 = st.columns(2)
+
+                with col1:
+                    st.markdown("#### Resume")
+                    spans = skill_highlights(resume_analysis, resume_offsets,
+                                             {skill: "matched" for skill in matched_skills})
+                    st.markdown(highlight_html(resume_text_extracted, spans), unsafe_allow_html=True)
+
+                with col2:
+                    st.markdown("#### Job Description")
+                    spans = skill_highlights(jd_analysis, jd_offsets, jd_kinds)
+                    st.markdown(highlight_html(jd_text_extracted, spans), unsafe_allow_html=True)
+
                 # Detailed breakdown table (removed Achievements)
                 st.markdown("---")
                 st.markdown("### 📋 Detailed Score Breakdown")
@@ -409,6 +550,39 @@ if run_btn and resume_text:
         else:
             st.info("No specific suggestions at this time.")
 
+    # Tab 5b: LLM rewrites, rendered one by one as their requests finish
+    with st.expander("AI Sentence Rewrites (Gemini)"):
+        st.caption("Sends your project/experience sentences to the Gemini API for rewriting.")
+        rewrites_key = f"rewrites_{run_key[0]}_{run_key[1]}"
+
+        if st.button("✍️ Rewrite project sentences"):
+            try:
+                from Rewriter.rewriter import select_project_sentences
+                from Rewriter.async_rewriter import stream_enhanced_sentences
+
+                cv_skills = list(resume_ner_output.get("SKILLS", []))
+                jd_skills = list(jd_ner_output.get("SKILLS", [])) if jd_ner_output else []
+                sentences = select_project_sentences(resume_text_extracted, jd_skills)
+                if not sentences:
+                    st.info("No project/experience sentences found that need rewriting.")
+                else:
+                    progress = st.progress(0.0, text=f"Rewriting {len(sentences)} sentences...")
+                    rewrites = []
+                    # A rerun interrupts this loop; closing the stream cancels the pending requests
+                    with closing(stream_enhanced_sentences(sentences, cv_skills,
+                                                           batch_size=REWRITE_BATCH_SIZE)) as stream:
+                        for result in stream:
+                            rewrites.append(result)
+                            render_rewrite(result)
+                            progress.progress(len(rewrites) / len(sentences),
+                                              text=f"{len(rewrites)}/{len(sentences)} sentences rewritten")
+                    st.session_state[rewrites_key] = sorted(rewrites, key=lambda r: r["index"])
+            except Exception as e:
+                st.error(f"❌ Sentence rewriting failed: {e}")
+        elif rewrites_key in st.session_state:
+            for result in st.session_state[rewrites_key]:
+                render_rewrite(result)
+
     # Tab 6: Download Enhanced Resume
     with st.expander("Generate Enhanced Resume"):
         st.subheader("📄 Download Your Enhanced Resume")